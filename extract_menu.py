@@ -2,12 +2,16 @@
 """
 README
 ------
-Dependencies: requests, beautifulsoup4, playwright
+Dependencies: httpx, lxml, orjson, playwright (optional: cython)
 
 Install:
-    pip install requests beautifulsoup4 playwright
+    pip install "httpx[http2]" lxml orjson playwright
     playwright install
 
+Optional compiled build (Cython pure-Python mode; the .py keeps working without it):
+    pip install cython
+    cythonize -i -3 extract_menu.py
+
 Usage:
     python extract_menu.py --url https://example.com --depth 1 --timeout 10 --user-agent "MyCrawler/1.0"
 """
@@ -15,15 +19,30 @@ Usage:
 from __future__ import annotations
 
 import argparse
-import json
+import asyncio
+import codecs
+import re
 import sys
 import time
-from collections import deque
+from functools import lru_cache
 from typing import Dict, Iterable, List, Optional, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
-import requests
-from bs4 import BeautifulSoup, NavigableString, Tag
+import httpx
+import orjson
+from lxml import etree
+from lxml import html as lxml_html
+
+try:
+    import cython
+except ImportError:  # Cython is optional: the pure-mode annotations below become no-ops
+    class cython:  # type: ignore[no-redef]
+        compiled = False
+        bint = bool
+
+        @staticmethod
+        def locals(**_types):
+            return lambda func: func
 
 
 FORBIDDEN_TEXT = ("privacy", "terms", "copyright", "contact-us", "contact us", "이메일무단수집")
@@ -39,16 +58,48 @@ MENU_CLASS_HINTS = (
     "drawer",
     "topbar",
 )
+# The crawl stops once this many candidates were collected; pages never contribute more than twice that
+MAX_CANDIDATES = 50
+# Menu containers the Playwright fallback waits for once the DOM is ready, and resources it never loads
+MENU_SELECTOR = "nav, header, [role='navigation']"
+BLOCKED_RESOURCE_TYPES = frozenset(("image", "font", "media"))
 DEFAULT_HEADERS = {
     "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
 }
 
+_FORBIDDEN_PATTERN = re.compile("|".join(map(re.escape, FORBIDDEN_TEXT)), re.IGNORECASE)
+_HINT_PATTERN = re.compile("|".join(map(re.escape, MENU_CLASS_HINTS)))
+_WS_RE = re.compile(r"\s+")
+_HIDDEN_TEXT_TAGS = frozenset(("script", "style", "template"))
+# Charset labels browsers (WHATWG) accept that Python's codecs registry does not know
+_CHARSET_LABEL_ALIASES = {"windows-949": "cp949", "x-sjis": "shift_jis"}
+_CODEC_OVERRIDES = {"euc_kr": "cp949"}
+
+# Region ranks in the order the original selectors were scanned: nav, header, [role='navigation'],
+# the .menu/.nav/... class hints, then every other anchor. A URL keeps the link from its lowest rank.
+_NAV_RANK = 0
+_HEADER_RANK = 1
+_ROLE_RANK = 2
+_HINT_RANK = 3
+_OTHER_RANK = 4
+
+# nav, header, [role='navigation'] and the .menu/.nav/... class selectors, compiled once into a single XPath
+_MENU_CONTAINERS = etree.XPath(
+    "//*[self::nav or self::header or @role='navigation' or "
+    + " or ".join(
+        f"contains(concat(' ', normalize-space(@class), ' '), ' {hint} ')" for hint in MENU_CLASS_HINTS
+    )
+    + "]"
+)
+
 
 def log(message: str) -> None:
     print(message, file=sys.stderr, flush=True)
 
 
+@lru_cache(maxsize=4096)
 def normalize_url(base: str, link: str, domain: str) -> Optional[str]:
+    """Resolve ``link`` against ``base``; ``domain`` must already be lower-cased."""
     if not link:
         return None
     if link.startswith(("mailto:", "tel:", "javascript:")):
@@ -60,166 +111,378 @@ def normalize_url(base: str, link: str, domain: str) -> Optional[str]:
     if parsed.scheme not in ("http", "https"):
         return None
 
-    if parsed.netloc and parsed.netloc.lower() != domain.lower():
+    if parsed.netloc and parsed.netloc.lower() != domain:
         return None
 
-    normalized = parsed._replace(fragment="").geturl()
-    return normalized
+    # urljoin already re-serialised the URL unless it handed ``link`` back verbatim (cross-scheme links),
+    # so without a fragment geturl() would rebuild the same string
+    if absolute is not link and "#" not in absolute:
+        return absolute
+    return parsed._replace(fragment="").geturl()
 
 
+@lru_cache(maxsize=8192)
+@cython.locals(text=str)
 def clean_text(text: str) -> str:
-    return " ".join(text.strip().split())
+    # Menu labels repeat on every crawled page; collapse whitespace in one regex scan and memoise it
+    return _WS_RE.sub(" ", text).strip()
 
 
+@cython.locals(text=str)
 def text_is_forbidden(text: str) -> bool:
-    lowered = text.lower()
-    return any(keyword in lowered for keyword in FORBIDDEN_TEXT)
+    return _FORBIDDEN_PATTERN.search(text) is not None
+
+
+@cython.locals(label=object, classes=object)
+def ancestor_label(element: etree._Element) -> Optional[str]:
+    label = None
+    if element.tag in {"nav", "header"}:
+        label = element.get("aria-label") or element.get("title") or element.get("id")
+    elif element.tag in {"ul", "ol"}:
+        label = element.get("aria-label") or element.get("class")
+    elif element.tag in {"section", "div"}:
+        classes = element.get("class")
+        if classes and _HINT_PATTERN.search(classes.lower()):
+            label = classes
+    if label:
+        label = clean_text(label)
+    return label or None
+
+
+@cython.locals(chain=tuple)
+def label_chain(element: Optional[etree._Element], cache: Dict[etree._Element, Tuple[str, ...]]) -> Tuple[str, ...]:
+    """Root-first labels of ``element`` and its ancestors, memoised per element in ``cache``."""
+    pending: List[etree._Element] = []
+    while element is not None and element not in cache:
+        pending.append(element)
+        element = element.getparent()
+
+    chain = cache[element] if element is not None else ()
+    for node in reversed(pending):
+        label = ancestor_label(node)
+        if label:
+            chain = chain + (label,)
+        cache[node] = chain
+    return chain
 
 
-def derive_path(link: Tag) -> List[str]:
+@cython.locals(chain=tuple, label=str)
+def derive_path(link: etree._Element, cache: Optional[Dict[etree._Element, Tuple[str, ...]]] = None) -> List[str]:
+    chain = label_chain(link.getparent(), {} if cache is None else cache)
+    # Keep the occurrence nearest to the link when a label repeats up the tree
     path: List[str] = []
-    for ancestor in link.parents:
-        if not isinstance(ancestor, Tag):
-            continue
-        label = None
-        if ancestor.name in {"nav", "header"}:
-            label = ancestor.get("aria-label") or ancestor.get("title") or ancestor.get("id")
-        elif ancestor.name in {"ul", "ol"}:
-            label = ancestor.get("aria-label") or ancestor.get("class")
-        elif ancestor.name in {"section", "div"}:
-            classes = ancestor.get("class") or []
-            if any(hint in " ".join(classes).lower() for hint in MENU_CLASS_HINTS):
-                label = " ".join(classes)
-        if label:
-            if isinstance(label, list):
-                label = " ".join(label)
-            label = clean_text(str(label))
-            if label and label not in path:
-                path.append(label)
+    seen: Set[str] = set()
+    for label in reversed(chain):
+        if label not in seen:
+            seen.add(label)
+            path.append(label)
     return list(reversed(path))
 
 
-def extract_candidates_from_soup(
-    soup: BeautifulSoup,
+def visible_text(element: etree._Element, parts: List[str]) -> None:
+    # Like BeautifulSoup's get_text: script/style/template contents and comments are not link text
+    if element.text:
+        parts.append(element.text)
+    for child in element:
+        if isinstance(child.tag, str) and child.tag not in _HIDDEN_TEXT_TAGS:
+            visible_text(child, parts)
+        if child.tail:
+            parts.append(child.tail)
+
+
+def link_text(link: etree._Element) -> str:
+    parts: List[str] = []
+    visible_text(link, parts)
+    return " ".join(part.strip() for part in parts if part.strip())
+
+
+def container_rank(element: etree._Element) -> int:
+    """Rank of a matched menu container; an element matching several selectors takes the first one."""
+    if element.tag == "nav":
+        return _NAV_RANK
+    if element.tag == "header":
+        return _HEADER_RANK
+    if element.get("role") == "navigation":
+        return _ROLE_RANK
+    return _HINT_RANK
+
+
+@cython.locals(rank=int)
+def region_rank(
+    element: Optional[etree._Element], containers: Dict[etree._Element, int], cache: Dict[etree._Element, int]
+) -> int:
+    """Lowest container rank among ``element`` and its ancestors, memoised per element in ``cache``."""
+    pending: List[etree._Element] = []
+    while element is not None and element not in cache:
+        pending.append(element)
+        element = element.getparent()
+
+    rank = cache[element] if element is not None else _OTHER_RANK
+    for node in reversed(pending):
+        rank = min(rank, containers.get(node, _OTHER_RANK))
+        cache[node] = rank
+    return rank
+
+
+@cython.locals(rank=int)
+def extract_candidates(
+    tree: etree._Element,
     base_url: str,
     domain: str,
-) -> Dict[str, Dict[str, object]]:
-    candidates: Dict[str, Dict[str, object]] = {}
+    max_candidates: Optional[int] = None,
+    collect_links: bool = True,
+) -> Tuple[Dict[str, Dict[str, object]], List[str]]:
+    """Return the menu candidates of a page and every same-domain link it points to.
+
+    Each anchor is ranked by the closest-to-nav region it sits in (nav, header, [role=navigation],
+    class hints, anywhere else) and a URL keeps the link from its lowest rank, first in document order
+    within that rank. With ``max_candidates`` only the first that many candidates are kept. Once that
+    many nav links are known the remaining anchors are only scanned for links, or skipped entirely
+    when ``collect_links`` is false.
+    """
+    domain = domain.lower()
+    containers = {element: container_rank(element) for element in _MENU_CONTAINERS(tree)}
+    rank_cache: Dict[etree._Element, int] = {}
+    label_cache: Dict[etree._Element, Tuple[str, ...]] = {}
+    buckets: List[Dict[str, Dict[str, object]]] = [{} for _ in range(_OTHER_RANK + 1)]
+    nav_candidates = buckets[_NAV_RANK]
+    outbound_links: List[str] = []
+    limit = max_candidates if max_candidates is not None else sys.maxsize
+
+    # Single pass over the anchors; every link is filed under its region rank
+    for link in tree.iter("a"):
+        href = link.get("href")
+        if href is None:
+            continue
+        normalized = normalize_url(base_url, href, domain)
+        if not normalized:
+            continue
+        outbound_links.append(normalized)
+        # Later anchors can neither outrank nor precede the nav links already collected
+        if len(nav_candidates) >= limit:
+            if not collect_links:
+                break
+            continue
 
-    def consider_link(tag: Tag) -> None:
-        text = clean_text(tag.get_text(separator=" ", strip=True))
+        text = clean_text(link_text(link))
         if not text or text_is_forbidden(text):
-            return
-        href = tag.get("href")
-        normalized = normalize_url(base_url, href or "", domain)
-        if not normalized:
-            return
-        if normalized not in candidates:
-            candidates[normalized] = {
+            continue
+
+        rank = region_rank(link.getparent(), containers, rank_cache)
+        bucket = buckets[rank]
+        if normalized not in bucket:
+            bucket[normalized] = {
                 "text": text,
                 "url": normalized,
-                "path": derive_path(tag),
+                "path": derive_path(link, label_cache),
             }
 
-    # Focus on likely menu containers first
-    for selector in ("nav", "header", "[role='navigation']"):
-        for container in soup.select(selector):
-            for link in container.find_all("a", href=True):
-                consider_link(link)
+    candidates: Dict[str, Dict[str, object]] = {}
+    for bucket in buckets:
+        for key, value in bucket.items():
+            if len(candidates) >= limit:
+                return candidates, outbound_links
+            candidates.setdefault(key, value)
+    return candidates, outbound_links
+
+
+@lru_cache(maxsize=64)
+def resolve_encoding(label: Optional[str]) -> Optional[str]:
+    """Map a declared charset label to a Python codec name, or None when the label is unknown.
+
+    libxml2 accepts some labels (e.g. ks_c_5601-1987) but then decodes nothing, so labels are
+    normalised before a parser is built. EUC-KR is read as its CP949 superset, as browsers do.
+    """
+    if not label:
+        return None
+    label = label.strip().strip("\"'").lower()
+    try:
+        name = codecs.lookup(_CHARSET_LABEL_ALIASES.get(label, label)).name
+    except LookupError:
+        return None
+    return _CODEC_OVERRIDES.get(name, name)
+
 
-    # Any elements with menu-like classes
-    hints = ",".join(f".{hint}" for hint in MENU_CLASS_HINTS)
-    for container in soup.select(hints):
-        for link in container.find_all("a", href=True):
-            consider_link(link)
+@lru_cache(maxsize=None)
+def html_parser(encoding: Optional[str]) -> lxml_html.HTMLParser:
+    # Parsers are reusable between documents; build one per declared encoding instead of per page
+    try:
+        return lxml_html.HTMLParser(encoding=encoding)
+    except LookupError:
+        # Unknown charset declared by the server: let lxml detect it instead
+        return html_parser(None)
 
-    # Fallback to all anchors
-    for link in soup.find_all("a", href=True):
-        consider_link(link)
 
-    return candidates
+def parse_html(content: bytes, encoding: Optional[str] = None) -> Optional[etree._Element]:
+    try:
+        return lxml_html.document_fromstring(content, parser=html_parser(resolve_encoding(encoding)))
+    except etree.ParserError:
+        return None
 
 
-def fetch_with_requests(
+async def fetch_page(client: httpx.AsyncClient, url: str) -> Optional[etree._Element]:
+    try:
+        start = time.time()
+        resp = await client.get(url)
+        elapsed = time.time() - start
+        log(f"[requests] status={resp.status_code} url={url} time={elapsed:.2f}s")
+    except httpx.HTTPError as exc:
+        log(f"[requests] error url={url} error={exc}")
+        return None
+
+    if resp.status_code >= 400:
+        return None
+
+    content_type = resp.headers.get("content-type", "")
+    if "html" not in content_type.lower():
+        return None
+
+    # Only pass the encoding when the server declared one, so lxml can sniff <meta charset> otherwise
+    return parse_html(resp.content, resp.charset_encoding)
+
+
+async def fetch_with_httpx(
     url: str,
     domain: str,
     depth: int,
     timeout: float,
     headers: Dict[str, str],
+    concurrency: int = 10,
 ) -> Dict[str, Dict[str, object]]:
-    visited: Set[str] = set()
+    visited: Set[str] = {url}
     results: Dict[str, Dict[str, object]] = {}
-    queue: deque[Tuple[str, int]] = deque([(url, 0)])
+    frontier: List[str] = [url]
+    current_depth = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    # Same-origin crawl: HTTP/2 multiplexes the concurrent requests over one connection
+    limits = httpx.Limits(max_connections=20, max_keepalive_connections=20)
+    async with httpx.AsyncClient(
+        http2=True,
+        headers=headers,
+        timeout=timeout,
+        limits=limits,
+        follow_redirects=True,
+    ) as client:
+
+        async def bounded_fetch(page_url: str) -> Optional[etree._Element]:
+            async with semaphore:
+                return await fetch_page(client, page_url)
+
+        # Crawl one BFS layer at a time; pages within a layer are fetched concurrently
+        while frontier:
+            pages = await asyncio.gather(*(bounded_fetch(page_url) for page_url in frontier))
+            next_frontier: List[str] = []
+
+            for page_url, tree in zip(frontier, pages):
+                if tree is None:
+                    continue
+
+                follow_links = current_depth + 1 <= depth
+                page_candidates, outbound_links = extract_candidates(
+                    tree, page_url, domain, max_candidates=2 * MAX_CANDIDATES, collect_links=follow_links
+                )
+                for key, value in page_candidates.items():
+                    if key not in results:
+                        results[key] = value
+
+                if follow_links:
+                    for normalized in outbound_links:
+                        if normalized not in visited:
+                            visited.add(normalized)
+                            next_frontier.append(normalized)
+
+                if len(results) > MAX_CANDIDATES:
+                    return results
+
+            frontier = next_frontier
+            current_depth += 1
 
-    session = requests.Session()
-    session.headers.update(headers)
-
-    while queue:
-        current_url, current_depth = queue.popleft()
-        if current_url in visited:
-            continue
-        visited.add(current_url)
-
-        try:
-            start = time.time()
-            resp = session.get(current_url, timeout=timeout)
-            elapsed = time.time() - start
-            log(f"[requests] status={resp.status_code} url={current_url} time={elapsed:.2f}s")
-        except requests.RequestException as exc:
-            log(f"[requests] error url={current_url} error={exc}")
-            continue
+    return results
 
-        if resp.status_code >= 400:
-            continue
 
-        content_type = resp.headers.get("content-type", "")
-        if "html" not in content_type.lower():
-            continue
+class PlaywrightSession:
+    """Keep one headless Chromium browser and context alive for several page loads."""
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        page_candidates = extract_candidates_from_soup(soup, current_url, domain)
-        for key, value in page_candidates.items():
-            if key not in results:
-                results[key] = value
+    def __init__(self, timeout: float, user_agent: Optional[str]) -> None:
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._playwright = None
+        self._browser = None
+        self._context = None
 
-        if current_depth + 1 <= depth:
-            for link in soup.find_all("a", href=True):
-                normalized = normalize_url(current_url, link.get("href", ""), domain)
-                if normalized and normalized not in visited:
-                    queue.append((normalized, current_depth + 1))
-
-        if len(results) > 50:
-            break
+    def __enter__(self) -> "PlaywrightSession":
+        from playwright.sync_api import sync_playwright  # type: ignore
 
-    return results
+        self._playwright = sync_playwright().start()
+        try:
+            self._browser = self._playwright.chromium.launch(headless=True)
+            self._context = self._browser.new_context(user_agent=self.user_agent)
+            self._context.route("**/*", self._route)
+        except Exception:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._context is not None:
+            self._context.close()
+            self._context = None
+        if self._browser is not None:
+            self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            self._playwright.stop()
+            self._playwright = None
+
+    @staticmethod
+    def _route(route) -> None:
+        # Anchors are all we need; skip the bytes that only matter for painting the page
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            route.abort()
+        else:
+            route.continue_()
+
+    def fetch(self, url: str) -> str:
+        """Render ``url`` in a fresh page of the shared context and return its HTML."""
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError  # type: ignore
+
+        page = self._context.new_page()
+        try:
+            page.goto(url, wait_until="domcontentloaded", timeout=self.timeout * 1000)
+            try:
+                # Client-rendered sites add their navigation after DOMContentLoaded
+                page.wait_for_selector(MENU_SELECTOR, timeout=3000)
+            except PlaywrightTimeoutError:
+                pass
+            return page.content()
+        finally:
+            page.close()
 
 
 def fetch_with_playwright(url: str, domain: str, timeout: float, user_agent: Optional[str]) -> Dict[str, Dict[str, object]]:
     try:
-        from playwright.sync_api import sync_playwright  # type: ignore
+        import playwright.sync_api  # type: ignore  # noqa: F401
     except ImportError:
         log("[playwright] playwright is not installed. Skipping step.")
         return {}
 
     candidates: Dict[str, Dict[str, object]] = {}
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(user_agent=user_agent)
-        page = context.new_page()
+    with PlaywrightSession(timeout, user_agent) as session:
         start = time.time()
         try:
-            page.goto(url, wait_until="networkidle", timeout=timeout * 1000)
+            html = session.fetch(url)
             elapsed = time.time() - start
             log(f"[playwright] loaded url={url} time={elapsed:.2f}s")
-            html = page.content()
-            soup = BeautifulSoup(html, "html.parser")
-            candidates = extract_candidates_from_soup(soup, url, domain)
+            tree = parse_html(html.encode("utf-8"), "utf-8")
+            if tree is not None:
+                candidates, _ = extract_candidates(tree, url, domain)
         except Exception as exc:  # pylint: disable=broad-except
             log(f"[playwright] error navigating url={url} error={exc}")
-        finally:
-            context.close()
-            browser.close()
 
     return candidates
 
@@ -246,7 +509,9 @@ def main() -> None:
 
     log(f"[info] Starting requests-based extraction url={args.url} depth={args.depth}")
     start = time.time()
-    request_candidates = fetch_with_requests(args.url, domain, max(args.depth, 0), args.timeout, headers)
+    request_candidates = asyncio.run(
+        fetch_with_httpx(args.url, domain, max(args.depth, 0), args.timeout, headers)
+    )
     request_time = time.time() - start
     log(f"[info] Requests extraction found {len(request_candidates)} candidates in {request_time:.2f}s")
 
@@ -274,8 +539,8 @@ def main() -> None:
         "menus": menu_list,
     }
 
-    json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
-    sys.stdout.write("\n")
+    sys.stdout.buffer.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+    sys.stdout.buffer.flush()
 
 
 if __name__ == "__main__":
@@ -1,12 +1,14 @@
-from pathlib import Path
+from contextlib import asynccontextmanager
+from pathlib import Path, PurePosixPath
 
 from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 
 from router import dashboard_router, sample_router, user_router, system_router
 from service.menu_service import fetch_menu_tree
+from service.system_service import close_http_client, close_playwright_browser
+from setting.templates import templates
 
 import logging
 
@@ -17,8 +19,16 @@ logging.basicConfig(
 
 BASE_DIR = Path(__file__).resolve().parent
 
-app = FastAPI(title="FastAPI Sample App")
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    yield
+    # 메뉴 수집에서 재사용하던 httpx 클라이언트와 Playwright 브라우저를 앱 종료 시 정리한다.
+    await close_http_client()
+    await close_playwright_browser()
+
+
+app = FastAPI(title="FastAPI Sample App", lifespan=lifespan)
 app.mount("/static", StaticFiles(directory=str(BASE_DIR / "static")), name="static")
 app.include_router(sample_router)
 app.include_router(dashboard_router)
@@ -31,15 +41,24 @@ async def attach_admin_menu(request: Request, call_next):
     """관리자 경로 진입 시 메뉴 트리를 미리 조회해 request.state에 저장한다."""
     request.state.menu_tree = []
     request.state.menu_error = None
-    if request.url.path.startswith("/admin"):
+    if _needs_admin_menu(request):
         try:
-            request.state.menu_tree = await fetch_menu_tree(current_path=request.url.path)
+            request.state.menu_tree = await fetch_menu_tree()
         except Exception as exc:  # pylint: disable=broad-except
             request.state.menu_error = str(exc)
     response = await call_next(request)
     return response
 
 
+def _needs_admin_menu(request: Request) -> bool:
+    """사이드바를 렌더링할 수 있는 관리자 페이지 요청인지 판별한다."""
+    path = request.url.path
+    if not path.startswith("/admin") or request.method != "GET":
+        return False
+    # /admin/*.js 처럼 확장자가 있는 정적 리소스 요청은 메뉴가 필요 없다.
+    return not PurePosixPath(path).suffix
+
+
 @app.get("/", response_class=HTMLResponse)
 async def read_root(request: Request):
     """Render the landing page using a Jinja2 template."""
@@ -1,17 +1,14 @@
 from __future__ import annotations
 
 import asyncio
-from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Request
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
 
-from setting.supabase_client import supabase
-from service.dashboard_service import fetch_weekly_login_stats, fetch_inspection_systems_count, fetch_inspection_system_menus_count, fetch_today_inspection_error_count
-
-BASE_DIR = Path(__file__).resolve().parents[2]
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
+from setting.templates import templates
+from setting.supabase_client import async_supabase
+from service.dashboard_service import DASHBOARD_SUMMARY_KEYS, fetch_dashboard_summary
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -23,48 +20,19 @@ async def redirect_to_dashboard() -> RedirectResponse:
 
 @router.get("/dashboard", response_class=HTMLResponse, name="admin_dashboard")
 async def admin_dashboard(request: Request):
-    logs = []
-    status_error = None
-    
-    weekly_stats = None
-    weekly_stats_error = None
-    
-    systems_count = None
-    systems_count_error = None
-    
-    menus_count = None
-    menus_count_error = None
-    
-    inspection_error_count = None
-    inspection_error_count_error = None
-
-    try:
-        response = await asyncio.to_thread(
-            lambda: supabase.table("status_logs").select("*").order("created_at", desc=True).limit(5).execute()
-        )
-        logs = response.data
-    except Exception as exc:  # pylint: disable=broad-except
-        status_error = str(exc)
-
-    try:
-        weekly_stats = await fetch_weekly_login_stats()
-    except Exception as exc:  # pylint: disable=broad-except
-        weekly_stats_error = str(exc)
-
-    try:
-        systems_count = await fetch_inspection_systems_count()
-    except Exception as exc:  # pylint: disable=broad-except
-        systems_count_error = str(exc)
-
-    try:
-        menus_count = await fetch_inspection_system_menus_count()
-    except Exception as exc:  # pylint: disable=broad-except
-        menus_count_error = str(exc)
+    # 서로 독립적인 조회이므로 동시에 실행하고, 실패한 항목만 오류로 표시한다.
+    logs_result, summary_result = await asyncio.gather(
+        _fetch_status_logs(),
+        fetch_dashboard_summary(),
+        return_exceptions=True,
+    )
 
-    try:
-        inspection_error_count = await fetch_today_inspection_error_count()
-    except Exception as exc:  # pylint: disable=broad-except
-        inspection_error_count_error = str(exc)
+    logs, status_error = _split_result(logs_result, [])
+    summary, summary_error = _split_result(summary_result, {})
+    if summary_error is not None:
+        # 요약 조회 자체가 실패하면 모든 카드에 같은 오류를 표시한다.
+        for key in DASHBOARD_SUMMARY_KEYS:
+            summary[key], summary[f"{key}_error"] = None, summary_error
 
     return templates.TemplateResponse(
         "admin/dashboard.html",
@@ -72,29 +40,34 @@ async def admin_dashboard(request: Request):
             "request": request,
             "supabase_logs": logs,
             "supabase_error": status_error,
-            "weekly_login_stats": weekly_stats,
-            "weekly_login_stats_error": weekly_stats_error,
-            "systems_count": systems_count,
-            "systems_count_error": systems_count_error,
-            "menus_count": menus_count,
-            "menus_count_error": menus_count_error,
-            "inspection_error_count": inspection_error_count,
-            "inspection_error_count_error": inspection_error_count_error,
+            **summary,
         },
     )
 
 
+async def _fetch_status_logs() -> List[Dict[str, Any]]:
+    response = await (
+        async_supabase.table("status_logs").select("*").order("created_at", desc=True).limit(5).execute()
+    )
+    return response.data
+
+
+def _split_result(result: Any, default: Any = None) -> Tuple[Any, Optional[str]]:
+    """asyncio.gather(return_exceptions=True) 결과를 (값, 오류 메시지)로 나눈다."""
+    if isinstance(result, Exception):
+        return default, str(result)
+    return result, None
+
+
 @router.get("/sample", response_class=HTMLResponse, name="admin_sample")
 async def admin_sample(request: Request):
     return templates.TemplateResponse("admin/sample.html", {"request": request})
 
 
-@router.get("/dashboard/status", response_class=JSONResponse, name="admin_dashboard_status")
+@router.get("/dashboard/status", response_class=ORJSONResponse, name="admin_dashboard_status")
 async def admin_dashboard_status():
     try:
-        response = await asyncio.to_thread(
-            lambda: supabase.table("status_logs").select("*").order("created_at", desc=True).limit(5).execute()
-        )
-        return JSONResponse({"ok": True, "data": response.data})
+        logs = await _fetch_status_logs()
+        return ORJSONResponse({"ok": True, "data": logs})
     except Exception as exc:  # pylint: disable=broad-except
-        return JSONResponse({"ok": False, "error": str(exc)}, status_code=500)
+        return ORJSONResponse({"ok": False, "error": str(exc)}, status_code=500)
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-from pathlib import Path
 from typing import Any, Dict, Optional
 
+import orjson
 from fastapi import APIRouter, HTTPException, Request, status
-from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, ORJSONResponse, RedirectResponse
 
+from setting.templates import templates
 from service.system_service import (
     collect_system_menus,
     create_system,
@@ -16,9 +16,6 @@ from service.system_service import (
     update_system,
 )
 
-BASE_DIR = Path(__file__).resolve().parents[2]
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
-
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
@@ -39,16 +36,20 @@ async def admin_system(request: Request):
 
 
 async def _parse_system_payload(request: Request) -> Dict[str, Any]:
+    body = await request.body()
+    if not body:
+        return {}
+
     content_type = request.headers.get("content-type", "")
     if "application/json" in content_type:
-        return await request.json()
+        return orjson.loads(body)
 
     # 지원하지 않는 컨텐츠 타입도 폼으로 처리
     form = await request.form()
     return dict(form)
 
 
-@router.post("/system", response_class=JSONResponse, name="admin_system_create")
+@router.post("/system", response_class=ORJSONResponse, name="admin_system_create")
 async def admin_system_create(request: Request):
     payload = await _parse_system_payload(request)
 
@@ -63,10 +64,10 @@ async def admin_system_create(request: Request):
     if "application/json" not in accept and ("text/html" in accept or not accept):
         return RedirectResponse(url="/admin/system", status_code=status.HTTP_303_SEE_OTHER)
 
-    return JSONResponse({"ok": True, "data": system}, status_code=status.HTTP_201_CREATED)
+    return ORJSONResponse({"ok": True, "data": system}, status_code=status.HTTP_201_CREATED)
 
 
-@router.put("/system/{system_code}", response_class=JSONResponse, name="admin_system_update")
+@router.put("/system/{system_code}", response_class=ORJSONResponse, name="admin_system_update")
 async def admin_system_update(system_code: str, request: Request):
     payload = await _parse_system_payload(request)
 
@@ -76,10 +77,10 @@ async def admin_system_update(system_code: str, request: Request):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except Exception as exc:  # pylint: disable=broad-except
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
-    return JSONResponse({"ok": True, "data": system})
+    return ORJSONResponse({"ok": True, "data": system})
 
 
-@router.delete("/system/{system_code}", response_class=JSONResponse, name="admin_system_delete")
+@router.delete("/system/{system_code}", response_class=ORJSONResponse, name="admin_system_delete")
 async def admin_system_delete(system_code: str):
     try:
         await delete_system(system_code)
@@ -87,10 +88,10 @@ async def admin_system_delete(system_code: str):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(exc)) from exc
     except Exception as exc:  # pylint: disable=broad-except
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
-    return JSONResponse({"ok": True})
+    return ORJSONResponse({"ok": True})
 
 
-@router.get("/system/{system_code}/menus", response_class=JSONResponse, name="admin_system_menus")
+@router.get("/system/{system_code}/menus", response_class=ORJSONResponse, name="admin_system_menus")
 async def admin_system_menus(system_code: str):
     try:
         menus = await fetch_system_menus(system_code)
@@ -98,23 +99,16 @@ async def admin_system_menus(system_code: str):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
     except Exception as exc:  # pylint: disable=broad-except
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
-    return JSONResponse({"ok": True, "data": menus})
+    return ORJSONResponse({"ok": True, "data": menus})
 
 
-@router.post("/system/{system_code}/menus/collect", response_class=JSONResponse, name="admin_system_collect_menus")
+@router.post("/system/{system_code}/menus/collect", response_class=ORJSONResponse, name="admin_system_collect_menus")
 async def admin_system_collect_menus(system_code: str, request: Request):
-    created_by: Optional[str] = None
-    content_length = request.headers.get("content-length")
-    if content_length and content_length.isdigit() and int(content_length) > 0:
-        content_type = request.headers.get("content-type", "")
-        try:
-            if "application/json" in content_type:
-                payload = await request.json()
-            else:
-                payload = dict(await request.form())
-        except Exception:  # pylint: disable=broad-except
-            payload = {}
-        created_by = payload.get("created_by")
+    try:
+        payload = await _parse_system_payload(request)
+    except Exception:  # pylint: disable=broad-except
+        payload = {}
+    created_by: Optional[str] = payload.get("created_by")
 
     try:
         result = await collect_system_menus(system_code, created_by=created_by)
@@ -123,4 +117,4 @@ async def admin_system_collect_menus(system_code: str, request: Request):
     except Exception as exc:  # pylint: disable=broad-except
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(exc)) from exc
 
-    return JSONResponse({"ok": True, "data": result})
+    return ORJSONResponse({"ok": True, "data": result})
@@ -1,17 +1,14 @@
 from __future__ import annotations
 
-from pathlib import Path
+import asyncio
 
 from fastapi import APIRouter, HTTPException, Request, status
-from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from pydantic import BaseModel, EmailStr
 
+from setting.templates import templates
 from service.user_service import create_user, fetch_user_history, fetch_users
 
-BASE_DIR = Path(__file__).resolve().parents[2]
-templates = Jinja2Templates(directory=str(BASE_DIR / "templates"))
-
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
@@ -24,19 +21,25 @@ async def admin_user(request: Request):
     total_user_count = None
     active_user_count = None
 
-    try:
-        users = await fetch_users()
+    user_result, history_result = await asyncio.gather(
+        fetch_users(),
+        fetch_user_history(limit=50),
+        return_exceptions=True,
+    )
+
+    if isinstance(user_result, Exception):
+        user_error = str(user_result)
+    else:
+        users = user_result
         total_user_count = len(users)
         active_user_count = sum(
             1 for user in users if str(user.get("login_status") or "").lower() == "online"
         )
-    except Exception as exc:  # pylint: disable=broad-except
-        user_error = str(exc)
 
-    try:
-        histories = await fetch_user_history(limit=50)
-    except Exception as exc:  # pylint: disable=broad-except
-        history_error = str(exc)
+    if isinstance(history_result, Exception):
+        history_error = str(history_result)
+    else:
+        histories = history_result
 
     return templates.TemplateResponse(
         "admin/user.html",
@@ -60,7 +63,7 @@ class UserCreateRequest(BaseModel):
     role: str | None = None
 
 
-@router.post("/api/users", response_class=JSONResponse)
+@router.post("/api/users", response_class=ORJSONResponse)
 async def create_user_api(payload: UserCreateRequest):
     try:
         created = await create_user(payload.dict())
@@ -1,25 +1,25 @@
 from __future__ import annotations
 
 import re
-from pathlib import Path
-from typing import Dict
+import sys
+from types import MappingProxyType
+from typing import Mapping
 
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
 
-BASE_DIR = Path(__file__).resolve().parent.parent
-TEMPLATE_DIR = BASE_DIR / "templates"
+from setting.templates import TEMPLATE_DIR, templates
+
 SAMPLE_DIR = TEMPLATE_DIR / "sample"
 
-templates = Jinja2Templates(directory=str(TEMPLATE_DIR))
 router = APIRouter(prefix="/sample", tags=["sample"])
 
-_slug_pattern = re.compile(r"^[a-z0-9-]+$")
-_sample_templates: Dict[str, str] = {
-    page.stem: str(page.relative_to(TEMPLATE_DIR)).replace("\\", "/")
+_slug_pattern = re.compile(r"[a-z0-9-]+\Z")
+# 샘플 목록은 import 시점에 한 번만 만들고 요청 처리 중에는 읽기 전용으로 사용한다.
+_sample_templates: Mapping[str, str] = MappingProxyType({
+    sys.intern(page.stem): str(page.relative_to(TEMPLATE_DIR)).replace("\\", "/")
     for page in SAMPLE_DIR.glob("*.html")
-}
+})
 
 
 @router.get("/", response_class=HTMLResponse, summary="샘플 대시보드 페이지")
@@ -31,7 +31,7 @@ async def render_sample_index(request: Request):
 
 @router.get("/{page_slug}", response_class=HTMLResponse, summary="샘플 HTML 렌더링")
 async def render_sample_page(page_slug: str, request: Request):
-    if not _slug_pattern.fullmatch(page_slug):
+    if not _slug_pattern.match(page_slug):
         raise HTTPException(status_code=400, detail="허용되지 않는 페이지 식별자입니다.")
 
     template_path = _sample_templates.get(page_slug)
@@ -0,0 +1,348 @@
+# 메뉴 수집에서 링크마다 반복 실행되는 함수들.
+# Cython pure-Python 모드로 작성되어 그대로도 동작하며, Cython이 있으면 제자리에서 컴파일해 사용할 수 있다.
+#     pip install cython
+#     cythonize -i -3 service/_menu_fast.py
+from __future__ import annotations
+
+import codecs
+import io
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+from bs4 import BeautifulSoup, Tag
+from bs4.dammit import EncodingDetector
+from lxml import etree
+
+try:
+    import cython
+except ImportError:  # Cython이 없으면 아래 타입 선언은 아무 일도 하지 않는다.
+    class cython:  # type: ignore[no-redef]
+        compiled = False
+        bint = bool
+        int = int
+
+        @staticmethod
+        def locals(**_types):
+            return lambda func: func
+
+try:
+    # WHATWG URL 파서(C++ ada)의 바인딩. 설치되어 있지 않으면 urllib.parse로 처리한다.
+    import ada_url
+except ImportError:  # pragma: no cover - 선택 의존성
+    ada_url = None
+
+FORBIDDEN_TEXT = ("privacy", "terms", "copyright", "contact-us", "contact us", "이메일무단수집")
+MENU_CLASS_HINTS = (
+    "menu",
+    "nav",
+    "navbar",
+    "gnb",
+    "lnb",
+    "main-nav",
+    "site-nav",
+    "sidebar",
+    "drawer",
+    "topbar",
+)
+
+# 같은 URL의 링크 중 어느 것을 후보로 쓸지 정하는 영역 순위. 낮을수록 우선한다.
+_NAV_TAG_RANKS = {"nav": 0, "header": 1}
+_NAV_RANK = 0
+_ROLE_RANK = 2
+_HINT_RANK = 3
+_OTHER_RANK = 4
+_MENU_HINT_CLASSES = frozenset(MENU_CLASS_HINTS)
+# derive_path에서 경로 라벨을 만드는 태그
+_LABEL_TAGS = frozenset({"nav", "header", "ul", "ol", "section", "div"})
+# 제외할 문구를 한 번의 검색으로 찾는다.
+_FORBIDDEN_RE = re.compile("|".join(map(re.escape, FORBIDDEN_TEXT)), re.IGNORECASE)
+# 클래스 문자열에 힌트가 부분 문자열로 들어 있는지 한 번에 검사한다.
+_MENU_HINT_RE = re.compile("|".join(map(re.escape, MENU_CLASS_HINTS)))
+
+# 파이썬 codecs가 모르는 charset 라벨 중 브라우저(WHATWG)가 받아 주는 것
+_CHARSET_LABEL_ALIASES = {"windows-949": "cp949", "x-sjis": "shift_jis"}
+# 브라우저처럼 EUC-KR 라벨(ks_c_5601-1987 등)은 상위 집합인 CP949로 읽는다.
+_CODEC_OVERRIDES = {"euc_kr": "cp949"}
+
+MenuCandidate = Dict[str, Any]
+CandidateMap = Dict[str, MenuCandidate]
+# 어떤 요소부터 문서 루트까지의 (영역 순위, 링크에 가까운 순서의 경로 라벨)
+AncestorState = Tuple[int, Tuple[str, ...]]
+_ROOT_STATE: AncestorState = (_OTHER_RANK, ())
+
+
+@lru_cache(maxsize=4096)
+def normalize_url(base: str, link: str, domain: str) -> Optional[str]:
+    """link를 base 기준 절대 URL로 바꾼다. 같은 메뉴 링크가 페이지마다 반복되므로 결과를 재사용하며, domain은 소문자로 넘긴다."""
+    if not link:
+        return None
+    if link.startswith(("mailto:", "tel:", "javascript:")):
+        return None
+
+    if ada_url is not None:
+        try:
+            resolved = ada_url.URL(link, base)
+        except ValueError:
+            return None
+        if resolved.protocol not in ("http:", "https:"):
+            return None
+        if resolved.host != domain:
+            return None
+        resolved.hash = ""
+        return resolved.href
+
+    absolute = urljoin(base, link)
+    parsed = urlparse(absolute)
+
+    if parsed.scheme not in ("http", "https"):
+        return None
+
+    if parsed.netloc and parsed.netloc.lower() != domain:
+        return None
+
+    normalized = parsed._replace(fragment="").geturl()
+    return normalized
+
+
+def crawl_host(url: str) -> str:
+    """normalize_url이 링크의 호스트와 비교하는 형태(소문자, ada 사용 시 기본 포트 제외)로 url의 호스트를 구한다."""
+    if ada_url is not None:
+        return ada_url.URL(url).host
+    return urlparse(url).netloc.lower()
+
+
+@lru_cache(maxsize=64)
+def resolve_encoding(label: Optional[str]) -> Optional[str]:
+    """Content-Type 등에 적힌 charset 라벨을 파이썬 코덱 이름으로 바꾼다. 알 수 없는 라벨이면 None을 반환한다."""
+    if not label:
+        return None
+    label = label.strip().strip("\"'").lower()
+    try:
+        name = codecs.lookup(_CHARSET_LABEL_ALIASES.get(label, label)).name
+    except LookupError:
+        return None
+    return _CODEC_OVERRIDES.get(name, name)
+
+
+@cython.locals(text=str)
+def clean_text(text: str) -> str:
+    return " ".join(text.strip().split())
+
+
+@cython.locals(text=str)
+def text_is_forbidden(text: str) -> cython.bint:
+    return _FORBIDDEN_RE.search(text) is not None
+
+
+@cython.locals(label=object, joined=str)
+def _ancestor_label(name: str, get: Any, classes: Any) -> Optional[str]:
+    """경로 라벨을 만드는 태그(_LABEL_TAGS)의 라벨을 구한다. get은 속성 조회 함수, classes는 클래스 목록이다."""
+    label = None
+    if name in {"nav", "header"}:
+        label = get("aria-label") or get("title") or get("id")
+    elif name in {"ul", "ol"}:
+        label = get("aria-label") or get("class")
+    elif classes:
+        joined = " ".join(classes)
+        if _MENU_HINT_RE.search(joined.lower()):
+            label = joined
+    if not label:
+        return None
+    if isinstance(label, list):
+        label = " ".join(label)
+    return clean_text(str(label))
+
+
+@cython.locals(rank=cython.int)
+def _ancestor_state(parent: AncestorState, name: str, get: Any, classes: Any) -> AncestorState:
+    """부모까지의 상태에 이 요소를 더해, 이 요소부터 문서 루트까지의 (영역 순위, 가까운 순 라벨)을 구한다.
+
+    순위는 nav(0), header(1), role="navigation"(2), 메뉴 클래스 힌트(3), 그 외(4) 영역 순으로 낮다.
+    라벨이 중복되면 링크에 더 가까운 것만 남긴다.
+    """
+    rank, labels = parent
+    # 이미 nav 안에 있으면 더 낮은 순위가 없으므로 영역 검사를 건너뛴다.
+    if rank > _NAV_RANK:
+        rank = min(rank, _NAV_TAG_RANKS.get(name, _OTHER_RANK))
+        if rank > _ROLE_RANK and get("role") == "navigation":
+            rank = _ROLE_RANK
+        if rank > _HINT_RANK and not _MENU_HINT_CLASSES.isdisjoint(classes):
+            rank = _HINT_RANK
+
+    if name in _LABEL_TAGS:
+        label = _ancestor_label(name, get, classes)
+        if label:
+            labels = (label,) + tuple(item for item in labels if item != label)
+    return rank, labels
+
+
+def derive_path(link: Tag, memo: Optional[Dict[int, AncestorState]] = None) -> Tuple[int, List[str]]:
+    """링크의 메뉴 영역 순위와 경로 라벨(바깥쪽부터)을 구한다.
+
+    memo를 넘기면 상위 요소별 상태를 id(tag)로 저장해 같은 부모를 가진 링크끼리 다시 계산하지 않는다.
+    memo는 soup가 살아 있는 동안(한 페이지 안에서)만 사용한다.
+    """
+    pending: List[Tag] = []
+    state = _ROOT_STATE
+    for ancestor in link.parents:
+        if memo is not None:
+            cached = memo.get(id(ancestor))
+            if cached is not None:
+                state = cached
+                break
+        pending.append(ancestor)
+
+    for ancestor in reversed(pending):
+        attrs = ancestor.attrs
+        state = _ancestor_state(state, ancestor.name, attrs.get, attrs.get("class") or ())
+        if memo is not None:
+            memo[id(ancestor)] = state
+    return state[0], list(reversed(state[1]))
+
+
+def derive_element_path(
+    link: Any,
+    chain: Optional[List[Tuple[Any, AncestorState]]] = None,
+) -> Tuple[int, List[str]]:
+    """derive_path와 같은 규칙을 lxml 요소에 적용한다. lxml은 class 속성을 문자열로 주므로 나눠서 비교한다.
+
+    chain에는 직전 링크의 상위 요소와 상태가 루트부터 저장되어 있어, 공통 조상까지는 다시 계산하지 않는다.
+    iterparse 중 지나간 요소는 지워지므로 id 대신 요소 자체를 들고 있다가 비교한다.
+    """
+    ancestors = list(link.iterancestors())
+    ancestors.reverse()
+
+    shared = 0
+    if chain:
+        for element, (cached_element, _) in zip(ancestors, chain):
+            if element is not cached_element:
+                break
+            shared += 1
+        del chain[shared:]
+    state = chain[-1][1] if chain else _ROOT_STATE
+
+    for element in ancestors[shared:]:
+        get = element.get
+        class_attr = get("class")
+        state = _ancestor_state(state, element.tag, get, class_attr.split() if class_attr else ())
+        if chain is not None:
+            chain.append((element, state))
+    return state[0], list(reversed(state[1]))
+
+
+@cython.locals(rank=cython.int, text=str, normalized=object, existing=object)
+def extract_candidates_from_soup(
+    soup: BeautifulSoup,
+    base_url: str,
+    domain: str,
+    collect_links: bool = False,
+) -> Tuple[CandidateMap, List[str]]:
+    """링크를 한 번만 순회하며 메뉴 후보와 (collect_links일 때) 다음 단계에서 방문할 링크를 함께 모은다.
+
+    같은 URL을 가리키는 링크가 여러 개면 더 메뉴다운 영역(순위가 낮은 영역)의 링크를, 순위가 같으면
+    문서에서 먼저 나온 링크를 사용한다.
+    """
+    ranked: Dict[str, Tuple[int, MenuCandidate]] = {}
+    links: List[str] = []
+    memo: Dict[int, AncestorState] = {}
+    domain = domain.lower()
+
+    for tag in soup.find_all("a", href=True):
+        normalized = normalize_url(base_url, tag.get("href") or "", domain)
+        if not normalized:
+            continue
+        if collect_links:
+            links.append(normalized)
+
+        text = clean_text(tag.get_text(separator=" ", strip=True))
+        if not text or text_is_forbidden(text):
+            continue
+
+        existing = ranked.get(normalized)
+        if existing and existing[0] == _NAV_RANK:
+            continue
+        rank, path = derive_path(tag, memo)
+        if existing and existing[0] <= rank:
+            continue
+        ranked[normalized] = (rank, {"text": text, "url": normalized, "path": path})
+
+    candidates: CandidateMap = {key: candidate for key, (_, candidate) in ranked.items()}
+    return candidates, links
+
+
+@cython.locals(rank=cython.int, text=str, normalized=object, existing=object)
+def extract_candidates_streaming(
+    content: bytes,
+    encoding: Optional[str],
+    base_url: str,
+    domain: str,
+    collect_links: bool = False,
+) -> Tuple[CandidateMap, List[str]]:
+    """extract_candidates_from_soup과 같은 결과를 lxml iterparse로 구한다.
+
+    전체 DOM을 BeautifulSoup 객체로 만들지 않고 링크가 닫힐 때마다 처리한 뒤, 링크와 그 상위 요소들의
+    앞쪽 형제(이미 끝난 하위 트리)를 지워 처리한 부분이 메모리에 쌓이지 않게 한다.
+    """
+    ranked: Dict[str, Tuple[int, MenuCandidate]] = {}
+    links: List[str] = []
+    chain: List[Tuple[Any, AncestorState]] = []
+    domain = domain.lower()
+
+    # 응답 헤더가 없으면 <meta>의 charset을 쓰고, 둘 다 없거나 알 수 없는 라벨이면 BeautifulSoup처럼 UTF-8을 먼저 시도한다.
+    codec = resolve_encoding(encoding) or resolve_encoding(
+        EncodingDetector.find_declared_encoding(content, is_html=True)
+    )
+    if codec is None:
+        try:
+            content.decode("utf-8")
+            codec = "utf-8"
+        except UnicodeDecodeError:
+            pass
+    # libxml2가 모르는 코덱 이름도 있으므로 UTF-8이 아닌 문서는 파이썬에서 UTF-8로 바꿔 넘긴다.
+    if codec is not None and codec != "utf-8":
+        content = content.decode(codec, "replace").encode("utf-8")
+        codec = "utf-8"
+
+    events = etree.iterparse(
+        io.BytesIO(content),
+        events=("end",),
+        tag="a",
+        html=True,
+        encoding=codec,
+        no_network=True,
+    )
+    try:
+        for _, anchor in events:
+            href = anchor.get("href")
+            normalized = normalize_url(base_url, href, domain) if href is not None else None
+            if normalized:
+                if collect_links:
+                    links.append(normalized)
+
+                # BeautifulSoup의 get_text처럼 script/style/template 안의 문자열은 링크 텍스트에서 뺀다.
+                etree.strip_elements(anchor, "script", "style", "template", with_tail=False)
+                text = clean_text(" ".join(anchor.itertext()))
+                if text and not text_is_forbidden(text):
+                    existing = ranked.get(normalized)
+                    if not existing or existing[0] != _NAV_RANK:
+                        rank, path = derive_element_path(anchor, chain)
+                        if not existing or existing[0] > rank:
+                            ranked[normalized] = (rank, {"text": text, "url": normalized, "path": path})
+
+            anchor.clear(keep_tail=True)
+            # 링크와 상위 요소마다 앞쪽 형제는 이미 닫힌 하위 트리이므로 지운다.
+            element = anchor
+            parent = element.getparent()
+            while parent is not None:
+                while element.getprevious() is not None:
+                    del parent[0]
+                element = parent
+                parent = element.getparent()
+    except etree.XMLSyntaxError:
+        # 본문이 비어 있는 등 파싱할 수 없는 문서는 지금까지 찾은 후보만 사용한다.
+        pass
+
+    candidates: CandidateMap = {key: candidate for key, (_, candidate) in ranked.items()}
+    return candidates, links
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+
+TTL = Union[float, Callable[..., float]]
+
+
+def async_ttl_cache(ttl: TTL) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """코루틴 결과를 인자별로 ttl초 동안 재사용하는 데코레이터.
+
+    ttl에 함수를 넘기면 호출 인자로 항목별 유효 시간을 정한다. 같은 키로 동시에 들어온 요청은
+    하나의 조회 결과를 함께 사용하고, 예외는 캐시하지 않는다. 데이터가 바뀌면 `cache_clear()`로
+    비운다. 새 값을 저장할 때 만료된 항목과 쓰이지 않는 잠금을 함께 지우므로, 주 단위 날짜처럼
+    키가 계속 바뀌어도 캐시가 커지지 않는다. 현재 항목 수는 `cache_size()`로 확인한다.
+    """
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        entries: Dict[Hashable, Tuple[float, T]] = {}
+        locks: Dict[Hashable, asyncio.Lock] = {}
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            key = (args, tuple(sorted(kwargs.items())))
+
+            cached = entries.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+
+            lock = locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                cached = entries.get(key)
+                if cached and cached[0] > time.monotonic():
+                    return cached[1]
+
+                value = await func(*args, **kwargs)
+                seconds = ttl(*args, **kwargs) if callable(ttl) else ttl
+                now = time.monotonic()
+                entries[key] = (now + seconds, value)
+                _evict_expired(now)
+                return value
+
+        def _evict_expired(now: float) -> None:
+            for stale in [k for k, (expires_at, _) in entries.items() if expires_at <= now]:
+                del entries[stale]
+            # 조회 중인 키의 잠금은 잡혀 있으므로 남고, 값이 없는 키의 잠금만 정리된다.
+            for idle in [k for k, lock in locks.items() if k not in entries and not lock.locked()]:
+                del locks[idle]
+
+        def cache_clear() -> None:
+            entries.clear()
+
+        def cache_size() -> int:
+            return len(entries)
+
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+        wrapper.cache_size = cache_size  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
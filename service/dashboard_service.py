@@ -2,20 +2,62 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timedelta, timedelta, timezone
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
-from setting.supabase_client import supabase
+from service.cache_service import async_ttl_cache
+from setting.supabase_client import async_supabase, unwrap_response
 
-async def fetch_weekly_login_stats() -> Dict[str, Any]:
-    """이번 주와 지난 주의 로그인 성공 횟수를 비교한다."""
-    now = datetime.now(timezone.utc)
+# 대시보드 카운터는 몇 초 단위로 정확할 필요가 없으므로 짧게 캐시한다.
+COUNT_CACHE_TTL = 30.0
+CURRENT_WEEK_LOGIN_TTL = 60.0
+
+
+# fetch_dashboard_summary가 채우는 카드 키. 각 키마다 `<키>_error`도 함께 담긴다.
+DASHBOARD_SUMMARY_KEYS = ("weekly_login_stats", "systems_count", "menus_count", "inspection_error_count")
+
+
+async def fetch_dashboard_summary() -> Dict[str, Any]:
+    """대시보드 카드 값을 동시에 조회하고, 실패한 항목은 `<키>_error`에 오류 메시지로 담는다."""
+    results = await asyncio.gather(
+        fetch_weekly_login_stats(),
+        fetch_inspection_systems_count(),
+        fetch_inspection_system_menus_count(),
+        fetch_today_inspection_error_count(),
+        return_exceptions=True,
+    )
+
+    summary: Dict[str, Any] = {}
+    for key, result in zip(DASHBOARD_SUMMARY_KEYS, results):
+        if isinstance(result, Exception):
+            summary[key], summary[f"{key}_error"] = None, str(result)
+        else:
+            summary[key], summary[f"{key}_error"] = result, None
+    return summary
+
+
+def _week_starts(now: datetime) -> Tuple[datetime, datetime, datetime]:
+    """now가 속한 주(월요일 00:00 UTC 시작)의 지난 주/이번 주/다음 주 시작 시각을 반환한다."""
     start_today = now.replace(hour=0, minute=0, second=0, microsecond=0)
     start_this_week = start_today - timedelta(days=start_today.weekday())
-    start_next_week = start_this_week + timedelta(days=7)
-    start_last_week = start_this_week - timedelta(days=7)
+    return start_this_week - timedelta(days=7), start_this_week, start_this_week + timedelta(days=7)
+
+
+def _weekly_stats_ttl() -> float:
+    """비교 결과는 CURRENT_WEEK_LOGIN_TTL 동안 재사용하되, 주가 바뀌는 시각을 넘기지 않는다."""
+    now = datetime.now(timezone.utc)
+    start_next_week = _week_starts(now)[2]
+    return min(CURRENT_WEEK_LOGIN_TTL, (start_next_week - now).total_seconds())
+
+
+@async_ttl_cache(_weekly_stats_ttl)
+async def fetch_weekly_login_stats() -> Dict[str, Any]:
+    """이번 주와 지난 주의 로그인 성공 횟수를 비교한다."""
+    start_last_week, start_this_week, start_next_week = _week_starts(datetime.now(timezone.utc))
 
-    this_week = await _count_success_logins(start_this_week, start_next_week)
-    last_week = await _count_success_logins(start_last_week, start_this_week)
+    this_week, last_week = await asyncio.gather(
+        _count_success_logins(start_this_week, start_next_week),
+        _count_success_logins(start_last_week, start_this_week),
+    )
 
     diff = this_week - last_week
 
@@ -41,95 +83,65 @@ async def fetch_weekly_login_stats() -> Dict[str, Any]:
     }
 
 
-async def _count_success_logins(start: datetime, end: datetime) -> int:
-    iso_start = start.isoformat()
-    iso_end = end.isoformat()
+def _login_count_ttl(start: datetime, end: datetime) -> float:
+    """이미 끝난 주는 값이 바뀌지 않으므로 '지난 주'로 쓰이는 동안(다음 주가 끝날 때까지) 캐시한다."""
+    now = datetime.now(timezone.utc)
+    if end > now:
+        return CURRENT_WEEK_LOGIN_TTL
+    return max((end + timedelta(days=7) - now).total_seconds(), CURRENT_WEEK_LOGIN_TTL)
+
 
-    def _query():
-        return (
-            supabase
-            .table("admin_user_history")
-            .select("menu_code", count="exact")
-            .eq("menu_code", "login")
-            .eq("result_status", "success")
-            .gte("created_at", iso_start)
-            .lt("created_at", iso_end)
-            .execute()
-        )
+@async_ttl_cache(_login_count_ttl)
+async def _count_success_logins(start: datetime, end: datetime) -> int:
+    # count_success_logins 함수가 부분 인덱스 범위만 세어 숫자 하나를 돌려준다.
+    response = await async_supabase.rpc(
+        "count_success_logins", {"p_start": start.isoformat(), "p_end": end.isoformat()}
+    ).execute()
 
-    response = await asyncio.to_thread(_query)
+    unwrap_response(response)
 
-    if getattr(response, "error", None):
-        raise ValueError(response.error.message if hasattr(response.error, "message") else str(response.error))
+    return int(response.data or 0)
 
-    if response.count is not None:
-        return response.count
 
-    return len(response.data or [])
+def _response_count(response: Any) -> int:
+    """head=True 조회는 본문 없이 Content-Range의 count만 받으므로 count가 없으면 오류로 처리한다."""
+    unwrap_response(response)
+    if response.count is None:
+        raise ValueError("조회 결과에 count 값이 없습니다.")
+    return response.count
 
-async def fetch_inspection_systems_count() -> int:
-    """inspection_systems 테이블에 등록된 시스템 수를 반환한다."""
 
-    def _query():
-        return supabase.table("inspection_systems").select("system_code", count="exact").execute()
+def invalidate_system_counts() -> None:
+    """시스템/메뉴가 추가·삭제되었을 때 캐시된 개수를 비운다."""
+    fetch_inspection_systems_count.cache_clear()
+    fetch_inspection_system_menus_count.cache_clear()
 
-    response = await asyncio.to_thread(_query)
 
-    if getattr(response, "error", None):
-        message = response.error.message if hasattr(response.error, "message") else str(response.error)
-        raise ValueError(message)
+@async_ttl_cache(COUNT_CACHE_TTL)
+async def fetch_inspection_systems_count() -> int:
+    """inspection_systems 테이블에 등록된 시스템 수를 반환한다."""
 
-    if response.count is not None:
-        return response.count
+    response = await async_supabase.table("inspection_systems").select("system_code", count="exact", head=True).execute()
 
-    return len(response.data or [])
+    return _response_count(response)
 
 
+@async_ttl_cache(COUNT_CACHE_TTL)
 async def fetch_inspection_system_menus_count() -> int:
     """inspection_system_menus 테이블에 등록된 메뉴 수를 반환한다."""
 
-    def _query():
-        return supabase.table("inspection_system_menus").select("menu_name", count="exact").execute()
-
-    response = await asyncio.to_thread(_query)
-
-    if getattr(response, "error", None):
-        message = response.error.message if hasattr(response.error, "message") else str(response.error)
-        raise ValueError(message)
-
-    if response.count is not None:
-        return response.count
+    response = await async_supabase.table("inspection_system_menus").select("menu_name", count="exact", head=True).execute()
 
-    return len(response.data or [])
+    return _response_count(response)
 
 
+@async_ttl_cache(COUNT_CACHE_TTL)
 async def fetch_today_inspection_error_count() -> int:
-    """오늘 날짜 기준으로 inspection_history에서 오류 수를 반환한다."""
-
-    now = datetime.now().astimezone()
-    start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
-    start_of_next_day = start_of_day + timedelta(days=1)
-
-    iso_start = start_of_day.isoformat()
-    iso_end = start_of_next_day.isoformat()
-
-    def _query():
-        return (
-            supabase.table("inspection_history")
-            .select("inspection_result", count="exact")
-            .eq("inspection_result", "error")
-            .gte("inspected_at", iso_start)
-            .lt("inspected_at", iso_end)
-            .execute()
-        )
-
-    response = await asyncio.to_thread(_query)
+    """오늘 날짜(Asia/Seoul) 기준으로 inspection_history에서 오류 수를 반환한다."""
 
-    if getattr(response, "error", None):
-        message = response.error.message if hasattr(response.error, "message") else str(response.error)
-        raise ValueError(message)
+    # 오늘의 시작/끝 시각은 count_today_inspection_errors 함수가 DB에서 계산한다.
+    response = await async_supabase.rpc("count_today_inspection_errors").execute()
 
-    if response.count is not None:
-        return response.count
+    unwrap_response(response)
 
-    return len(response.data or [])
+    return int(response.data or 0)
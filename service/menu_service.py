@@ -1,87 +1,109 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Any, Dict, List, Optional
-
-from setting.supabase_client import supabase
-
-
-async def fetch_menu_tree(
-    active_menu_code: Optional[str] = None, current_path: Optional[str] = None
-) -> List[Dict[str, Any]]:
-    """Supabase에서 관리자 메뉴를 조회해 트리 형태로 반환한다."""
-    result = await asyncio.to_thread(
-        lambda: supabase.table("admin_menus")
-        .select("*")
-        .order("sort_order")
-        .order("menu_code")
-        .execute()
-    )
-
-    rows: List[Dict[str, Any]] = result.data or []
-    tree = _build_tree(rows)
-    if active_menu_code or current_path:
-        _mark_active_branch(tree, active_menu_code, current_path)
-    return tree
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
 
+from setting.supabase_client import async_supabase, unwrap_response
 
-def _build_tree(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    tree: List[Dict[str, Any]] = []
-    lookup: Dict[str, Dict[str, Any]] = {}
+# 관리자 메뉴는 거의 바뀌지 않으므로 만들어진 트리를 재사용하고, 변경 시 invalidate_menu_cache()로 비운다.
+MENU_CACHE_TTL = 300.0
 
-    for row in rows:
-        node = {
-            "menu_seq": row.get("menu_seq"),
-            "parent_menu_code": row.get("parent_menu_code"),
-            "menu_code": row.get("menu_code"),
-            "menu_name": row.get("menu_name"),
-            "menu_path": row.get("menu_path"),
-            "icon_class": row.get("icon_class"),
-            "sort_order": row.get("sort_order", 0),
-            "children": [],
-            "is_active": False,
-            "has_active_child": False,
-            "raw": row,
-        }
-        lookup[node["menu_code"]] = node
 
-    for node in lookup.values():
-        parent_code: Optional[str] = node["parent_menu_code"]
-        if parent_code and parent_code in lookup:
-            lookup[parent_code]["children"].append(node)
-        else:
-            tree.append(node)
+@dataclass(slots=True)
+class MenuNode:
+    """사이드바에 렌더링되는 관리자 메뉴 노드."""
 
-    def sort_children(items: List[Dict[str, Any]]):
-        items.sort(key=lambda item: item.get("sort_order", 0))
-        for child in items:
-            if child["children"]:
-                sort_children(child["children"])
+    menu_seq: Optional[int]
+    parent_menu_code: Optional[str]
+    menu_code: str
+    menu_name: Optional[str]
+    menu_path: Optional[str]
+    icon_class: Optional[str]
+    sort_order: int = 0
+    children: List[MenuNode] = field(default_factory=list)
+    # 하위 메뉴들의 menu_path. 템플릿에서 현재 경로가 포함되면 메뉴를 펼친다.
+    child_paths: FrozenSet[str] = frozenset()
+
+
+# MenuNode 앞쪽 필드와 같은 순서의 admin_menus 컬럼. 조회 컬럼과 노드 생성에 함께 사용한다.
+_MENU_COLUMNS = ("menu_seq", "parent_menu_code", "menu_code", "menu_name", "menu_path", "icon_class")
+_MENU_SELECT = ", ".join(_MENU_COLUMNS + ("sort_order",))
+
+_menu_tree_cache: Optional[Tuple[float, List[MenuNode]]] = None
+_menu_tree_lock = asyncio.Lock()
+
+
+async def fetch_menu_tree() -> List[MenuNode]:
+    """Supabase에서 관리자 메뉴를 조회해 트리 형태로 반환한다.
+
+    트리는 요청과 무관하게 공유되며, 활성 메뉴 표시는 템플릿에서 현재 경로와 menu_path, child_paths를 비교해 정한다.
+    """
+    return await _fetch_cached_tree()
 
-    sort_children(tree)
-    return tree
 
+def invalidate_menu_cache() -> None:
+    """admin_menus가 변경되었을 때 캐시된 메뉴 트리를 비운다."""
+    global _menu_tree_cache
+    _menu_tree_cache = None
 
-def _mark_active_branch(
-    nodes: List[Dict[str, Any]], active_menu_code: Optional[str], current_path: Optional[str]
-) -> bool:
-    """활성 메뉴 코드 또는 현재 경로를 기준으로 트리 노드에 활성 상태를 표시한다."""
-    has_active_descendant = False
 
-    for node in nodes:
-        children: List[Dict[str, Any]] = node.get("children", [])
-        child_active = _mark_active_branch(children, active_menu_code, current_path) if children else False
+async def _fetch_cached_tree() -> List[MenuNode]:
+    """admin_menus 조회 후 만든 트리를 MENU_CACHE_TTL 동안 재사용한다."""
+    global _menu_tree_cache
 
-        node_active = False
-        if active_menu_code and node.get("menu_code") == active_menu_code:
-            node_active = True
-        if current_path and node.get("menu_path") == current_path:
-            node_active = True
+    cached = _menu_tree_cache
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
 
-        node["is_active"] = node_active
-        node["has_active_child"] = child_active
+    # 동시에 만료된 요청이 몰려도 Supabase 조회는 한 번만 수행한다.
+    async with _menu_tree_lock:
+        cached = _menu_tree_cache
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        result = await (
+            async_supabase.table("admin_menus")
+            .select(_MENU_SELECT)
+            .order("sort_order")
+            .order("menu_code")
+            .execute()
+        )
+        unwrap_response(result)
+        tree = _build_tree(result.data or [])
+        _menu_tree_cache = (time.monotonic() + MENU_CACHE_TTL, tree)
+        return tree
+
+
+def _build_tree(rows: List[Dict[str, Any]]) -> List[MenuNode]:
+    tree: List[MenuNode] = []
+    lookup: Dict[str, MenuNode] = {}
+
+    for row in rows:
+        get = row.get
+        node = MenuNode(*map(get, _MENU_COLUMNS), sort_order=get("sort_order", 0))
+        lookup[node.menu_code] = node
+
+    # rows가 이미 sort_order, menu_code 순으로 정렬되어 있어 순서대로 붙이면 자식 순서도 유지된다.
+    for node in lookup.values():
+        parent_code = node.parent_menu_code
+        if parent_code and parent_code in lookup:
+            lookup[parent_code].children.append(node)
+        else:
+            tree.append(node)
+
+    for node in tree:
+        _collect_child_paths(node)
+    return tree
 
-        if node_active or child_active:
-            has_active_descendant = True
 
-    return has_active_descendant
+def _collect_child_paths(node: MenuNode) -> FrozenSet[str]:
+    """하위 메뉴들의 menu_path를 child_paths에 저장하고, 자신을 포함한 경로 집합을 반환한다."""
+    paths: Set[str] = set()
+    for child in node.children:
+        paths |= _collect_child_paths(child)
+    node.child_paths = frozenset(paths)
+    if node.menu_path:
+        paths.add(node.menu_path)
+    return frozenset(paths)
@@ -1,226 +1,254 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
-import os
-import subprocess
-import sys
 import time
-from collections import deque
-from pathlib import Path
-from typing import Any, Deque, Dict, List, Optional, Set, Tuple
-from urllib.parse import urljoin, urlparse
-
-import requests
-from bs4 import BeautifulSoup, Tag
-
-from setting.supabase_client import supabase
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import httpx
+from bs4 import BeautifulSoup
+
+from service._menu_fast import (
+    CandidateMap,
+    MenuCandidate,
+    crawl_host,
+    extract_candidates_from_soup,
+    extract_candidates_streaming,
+)
+from service.dashboard_service import invalidate_system_counts
+from setting.supabase_client import supabase, unwrap_response
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_UA = "MenuExtractor/1.0"
-EXTRACT_MENU_SCRIPT = Path(__file__).resolve().parents[1] / "extract_menu.py"
-FORBIDDEN_TEXT = ("privacy", "terms", "copyright", "contact-us", "contact us", "이메일무단수집")
-MENU_CLASS_HINTS = (
-    "menu",
-    "nav",
-    "navbar",
-    "gnb",
-    "lnb",
-    "main-nav",
-    "site-nav",
-    "sidebar",
-    "drawer",
-    "topbar",
-)
 DEFAULT_HEADERS = {
     "accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8",
 }
 
-MenuCandidate = Dict[str, Any]
-CandidateMap = Dict[str, MenuCandidate]
+# 이만큼 메뉴 후보가 모이면 더 이상 페이지를 방문하지 않는다.
+MAX_CANDIDATES = 50
+# 한 번의 수집에서 동시에 요청하는 페이지 수
+CRAWL_CONCURRENCY = 16
 
+# 수집 요청 간에 keep-alive 커넥션을 재사용하도록 클라이언트를 하나만 만들어 두고, 앱 종료 시 close_http_client()로 닫는다.
+_http_client: Optional[httpx.AsyncClient] = None
 
-def _normalize_url(base: str, link: str, domain: str) -> Optional[str]:
-    if not link:
-        return None
-    if link.startswith(("mailto:", "tel:", "javascript:")):
-        return None
+# 크롤링한 페이지의 ETag/Last-Modified와 본문. 다시 수집할 때 조건부 요청으로 바뀌지 않은 페이지의 본문 전송을 건너뛴다.
+PAGE_CACHE_SIZE = 256
+_PAGE_CACHE: OrderedDict[str, Tuple[Optional[str], Optional[str], Tuple[bytes, Optional[str]]]] = OrderedDict()
 
-    absolute = urljoin(base, link)
-    parsed = urlparse(absolute)
+# 메뉴를 충분히 찾지 못했을 때 쓰는 Playwright 브라우저. 호출마다 Chromium을 새로 띄우지 않도록 재사용한다.
+_playwright: Any = None
+_browser: Any = None
+_browser_lock = asyncio.Lock()
 
-    if parsed.scheme not in ("http", "https"):
-        return None
 
-    if parsed.netloc and parsed.netloc.lower() != domain.lower():
-        return None
+def _parse_rendered_page(html: str, page_url: str, domain: str) -> CandidateMap:
+    """Playwright로 렌더링한 페이지에서 메뉴 후보를 추출한다.
 
-    normalized = parsed._replace(fragment="").geturl()
-    return normalized
-
-
-def _clean_text(text: str) -> str:
-    return " ".join(text.strip().split())
-
-
-def _text_is_forbidden(text: str) -> bool:
-    lowered = text.lower()
-    return any(keyword in lowered for keyword in FORBIDDEN_TEXT)
-
-
-def _derive_path(link: Tag) -> List[str]:
-    path: List[str] = []
-    for ancestor in link.parents:
-        if not isinstance(ancestor, Tag):
-            continue
-        label = None
-        if ancestor.name in {"nav", "header"}:
-            label = ancestor.get("aria-label") or ancestor.get("title") or ancestor.get("id")
-        elif ancestor.name in {"ul", "ol"}:
-            label = ancestor.get("aria-label") or ancestor.get("class")
-        elif ancestor.name in {"section", "div"}:
-            classes = ancestor.get("class") or []
-            if any(hint in " ".join(classes).lower() for hint in MENU_CLASS_HINTS):
-                label = " ".join(classes)
-        if label:
-            if isinstance(label, list):
-                label = " ".join(label)
-            label = _clean_text(str(label))
-            if label and label not in path:
-                path.append(label)
-    return list(reversed(path))
-
-
-def _extract_candidates_from_soup(
-    soup: BeautifulSoup,
-    base_url: str,
-    domain: str,
-) -> CandidateMap:
-    candidates: CandidateMap = {}
+    어떤 태그든 role="navigation"이나 메뉴 클래스로 영역 순위를 가질 수 있으므로 문서 전체를 파싱한다.
+    """
+    soup = BeautifulSoup(html, "lxml")
+    candidates, _ = extract_candidates_from_soup(soup, page_url, domain)
+    return candidates
 
-    def consider_link(tag: Tag) -> None:
-        text = _clean_text(tag.get_text(separator=" ", strip=True))
-        if not text or _text_is_forbidden(text):
-            return
-        href = tag.get("href")
-        normalized = _normalize_url(base_url, href or "", domain)
-        if not normalized:
-            return
-        if normalized not in candidates:
-            candidates[normalized] = {
-                "text": text,
-                "url": normalized,
-                "path": _derive_path(tag),
-            }
 
-    for selector in ("nav", "header", "[role='navigation']"):
-        for container in soup.select(selector):
-            for link in container.find_all("a", href=True):
-                consider_link(link)
+async def _fetch_page(url: str, timeout: float, headers: Dict[str, str]) -> Optional[Tuple[bytes, Optional[str]]]:
+    # 이전 수집에서 받은 페이지면 검증 헤더를 보내 바뀌지 않았을 때 본문 없이 304를 받는다.
+    cached = _PAGE_CACHE.get(url)
+    if cached:
+        etag, last_modified, _ = cached
+        headers = dict(headers)
+        if etag:
+            headers["if-none-match"] = etag
+        if last_modified:
+            headers["if-modified-since"] = last_modified
 
-    hints = ",".join(f".{hint}" for hint in MENU_CLASS_HINTS)
-    for container in soup.select(hints):
-        for link in container.find_all("a", href=True):
-            consider_link(link)
+    try:
+        start = time.time()
+        resp = await _get_http_client().get(url, timeout=timeout, headers=headers)
+        elapsed = time.time() - start
+        logger.debug("[httpx] status=%s url=%s time=%.2fs", resp.status_code, url, elapsed)
+    except httpx.HTTPError as exc:
+        logger.warning("[httpx] error url=%s error=%s", url, exc)
+        return None
 
-    for link in soup.find_all("a", href=True):
-        consider_link(link)
+    if resp.status_code == 304 and cached:
+        _PAGE_CACHE.move_to_end(url)
+        return cached[2]
 
-    return candidates
+    if resp.status_code >= 400:
+        return None
+
+    content_type = resp.headers.get("content-type", "")
+    if "html" not in content_type.lower():
+        return None
+
+    page = (resp.content, resp.charset_encoding)
+    etag = resp.headers.get("etag")
+    last_modified = resp.headers.get("last-modified")
+    if etag or last_modified:
+        _PAGE_CACHE[url] = (etag, last_modified, page)
+        _PAGE_CACHE.move_to_end(url)
+        if len(_PAGE_CACHE) > PAGE_CACHE_SIZE:
+            _PAGE_CACHE.popitem(last=False)
+    else:
+        _PAGE_CACHE.pop(url, None)
+    return page
 
 
-def _fetch_with_requests(
+async def _fetch_with_httpx(
     url: str,
     domain: str,
     depth: int,
     timeout: float,
     headers: Dict[str, str],
 ) -> CandidateMap:
-    visited: Set[str] = set()
+    # 큐에 넣을 때 기록해 각 URL이 frontier에 한 번만 들어가게 한다.
+    seen: Set[str] = {url}
     results: CandidateMap = {}
-    queue: Deque[Tuple[str, int]] = deque([(url, 0)])
+    frontier: List[str] = [url]
+    current_depth = 0
+    semaphore = asyncio.Semaphore(CRAWL_CONCURRENCY)
+    request_headers = {"user-agent": headers["user-agent"]}
+
+    async def bounded_fetch(page_url: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        async with semaphore:
+            return await _fetch_page(page_url, timeout, request_headers)
+
+    # BFS 단계별로 같은 깊이의 페이지를 동시에 요청하고, 결과는 frontier 순서대로 합친다.
+    while frontier:
+        pages = await asyncio.gather(*(bounded_fetch(page_url) for page_url in frontier))
+        next_frontier: List[str] = []
+
+        for page_url, page in zip(frontier, pages):
+            if page is None:
+                continue
+
+            follow_links = current_depth + 1 <= depth
+            # HTML 파싱은 CPU 작업이라 이벤트 루프를 막지 않도록 스레드에서 수행한다.
+            # 크롤링한 페이지는 DOM 전체를 만들지 않고 lxml iterparse로 링크만 훑는다.
+            try:
+                page_candidates, links = await asyncio.to_thread(
+                    extract_candidates_streaming, *page, page_url, domain, follow_links
+                )
+            except Exception as exc:  # pylint: disable=broad-except
+                # 한 페이지를 해석하지 못해도 나머지 크롤링은 계속한다.
+                logger.warning("[httpx] parse error url=%s error=%s", page_url, exc)
+                continue
+            for key, value in page_candidates.items():
+                if key not in results:
+                    results[key] = value
+
+            # 후보가 충분히 모이면 남은 링크를 큐에 넣지 않고 바로 끝낸다.
+            if len(results) >= MAX_CANDIDATES:
+                return results
+
+            for normalized in links:
+                if normalized not in seen:
+                    seen.add(normalized)
+                    next_frontier.append(normalized)
+
+        frontier = next_frontier
+        current_depth += 1
+
+    return results
+
 
-    session = requests.Session()
-    session.headers.update(headers)
+async def _get_browser() -> Any:
+    """Chromium을 처음 필요할 때 한 번만 띄우고 이후 호출에서 재사용한다. playwright가 없으면 None을 반환한다."""
+    global _playwright, _browser
 
-    while queue:
-        current_url, current_depth = queue.popleft()
-        if current_url in visited:
-            continue
-        visited.add(current_url)
+    async with _browser_lock:
+        if _browser is not None and _browser.is_connected():
+            return _browser
 
         try:
-            start = time.time()
-            resp = session.get(current_url, timeout=timeout)
-            elapsed = time.time() - start
-            logger.debug("[requests] status=%s url=%s time=%.2fs", resp.status_code, current_url, elapsed)
-        except requests.RequestException as exc:
-            logger.warning("[requests] error url=%s error=%s", current_url, exc)
-            continue
-
-        if resp.status_code >= 400:
-            continue
-
-        content_type = resp.headers.get("content-type", "")
-        if "html" not in content_type.lower():
-            continue
-
-        soup = BeautifulSoup(resp.text, "html.parser")
-        page_candidates = _extract_candidates_from_soup(soup, current_url, domain)
-        for key, value in page_candidates.items():
-            if key not in results:
-                results[key] = value
-
-        if current_depth + 1 <= depth:
-            for link in soup.find_all("a", href=True):
-                normalized = _normalize_url(current_url, link.get("href", ""), domain)
-                if normalized and normalized not in visited:
-                    queue.append((normalized, current_depth + 1))
-
-        if len(results) > 50:
-            break
+            from playwright.async_api import async_playwright  # type: ignore
+        except ImportError:
+            logger.info("playwright is not installed. skipping playwright extraction.")
+            return None
 
-    return results
+        if _playwright is None:
+            _playwright = await async_playwright().start()
+        start = time.time()
+        _browser = await _playwright.chromium.launch(headless=True)
+        logger.info("[playwright] launched chromium time=%.2fs", time.time() - start)
+        return _browser
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """크롤링용 httpx 클라이언트를 반환한다. 없거나 닫혔으면 새로 만든다.
+
+    user-agent와 timeout은 호출마다 다를 수 있어 요청 시 넘긴다.
+    """
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            http2=True,
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=CRAWL_CONCURRENCY, max_keepalive_connections=CRAWL_CONCURRENCY),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """크롤링에 재사용하던 httpx 클라이언트의 커넥션을 닫는다. 앱 종료 시 호출한다."""
+    global _http_client
+
+    client, _http_client = _http_client, None
+    if client is not None:
+        await client.aclose()
+
+
+async def close_playwright_browser() -> None:
+    """재사용하던 Playwright 브라우저를 닫는다. 앱 종료 시 호출한다."""
+    global _playwright, _browser
+
+    async with _browser_lock:
+        if _browser is not None:
+            await _browser.close()
+            _browser = None
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
 
 
-def _fetch_with_playwright(
+async def _fetch_with_playwright(
     url: str,
     domain: str,
     timeout: float,
     user_agent: Optional[str],
 ) -> CandidateMap:
-    try:
-        from playwright.sync_api import sync_playwright  # type: ignore
-    except ImportError:
-        logger.info("playwright is not installed. skipping playwright extraction.")
+    browser = await _get_browser()
+    if browser is None:
         return {}
 
     candidates: CandidateMap = {}
 
-    with sync_playwright() as playwright:
-        browser = playwright.chromium.launch(headless=True)
-        context = browser.new_context(user_agent=user_agent)
-        page = context.new_page()
+    # 브라우저는 공유하고, 쿠키와 user-agent가 섞이지 않도록 컨텍스트는 호출마다 새로 만든다.
+    context = await browser.new_context(user_agent=user_agent)
+    try:
+        page = await context.new_page()
         start = time.time()
-        try:
-            page.goto(url, wait_until="networkidle", timeout=timeout * 1000)
-            elapsed = time.time() - start
-            logger.debug("[playwright] loaded url=%s time=%.2fs", url, elapsed)
-            html = page.content()
-            soup = BeautifulSoup(html, "html.parser")
-            candidates = _extract_candidates_from_soup(soup, url, domain)
-        except Exception as exc:  # pylint: disable=broad-except
-            logger.warning("[playwright] error navigating url=%s error=%s", url, exc)
-        finally:
-            context.close()
-            browser.close()
+        await page.goto(url, wait_until="networkidle", timeout=timeout * 1000)
+        elapsed = time.time() - start
+        logger.debug("[playwright] loaded url=%s time=%.2fs", url, elapsed)
+        html = await page.content()
+        candidates = await asyncio.to_thread(_parse_rendered_page, html, url, domain)
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.warning("[playwright] error navigating url=%s error=%s", url, exc)
+    finally:
+        await context.close()
 
     return candidates
 
 
-def _collect_menu_candidates_internal(
+async def _collect_menu_candidates(
     url: str,
     depth: int,
     timeout: float,
@@ -231,12 +259,13 @@ def _collect_menu_candidates_internal(
         raise ValueError("유효한 도메인 주소가 필요합니다.")
 
     domain = parsed.netloc
+    target_host = crawl_host(url)
     headers = DEFAULT_HEADERS.copy()
     headers["user-agent"] = user_agent
 
-    logger.info("starting requests-based extraction url=%s depth=%s", url, depth)
+    logger.info("starting httpx-based extraction url=%s depth=%s", url, depth)
     start = time.time()
-    request_candidates = _fetch_with_requests(url, domain, max(depth, 0), timeout, headers)
+    request_candidates = await _fetch_with_httpx(url, target_host, max(depth, 0), timeout, headers)
     request_time = time.time() - start
     logger.info("requests extraction found %s candidates in %.2fs", len(request_candidates), request_time)
 
@@ -248,7 +277,7 @@ def _collect_menu_candidates_internal(
     if len(request_candidates) < 4:
         logger.info("fewer than 4 candidates found via requests. attempting playwright.")
         start = time.time()
-        playwright_candidates = _fetch_with_playwright(url, domain, timeout, user_agent)
+        playwright_candidates = await _fetch_with_playwright(url, target_host, timeout, user_agent)
         playwright_time = time.time() - start
         logger.info("playwright extraction found %s candidates in %.2fs", len(playwright_candidates), playwright_time)
         if playwright_candidates:
@@ -274,105 +303,6 @@ def _collect_menu_candidates_internal(
     return {"summary": summary, "menus": menu_list}
 
 
-def _collect_menu_candidates_via_script(
-    url: str,
-    depth: int,
-    timeout: float,
-    user_agent: str,
-) -> Dict[str, Any]:
-
-    interpreter = _resolve_python_interpreter()
-    if not EXTRACT_MENU_SCRIPT.exists():
-        raise FileNotFoundError("extract_menu.py 파일을 찾을 수 없습니다.")
-
-    command = [
-        interpreter,
-        str(EXTRACT_MENU_SCRIPT),
-        "--url",
-        url,
-        "--depth",
-        str(depth),
-        "--timeout",
-        str(timeout),
-        "--user-agent",
-        user_agent,
-    ]
-
-    completed = subprocess.run(
-        command,
-        check=False,
-        capture_output=True,
-        text=True,
-        env=os.environ.copy(),
-    )
-
-    stderr_text = (completed.stderr or "").strip()
-    if stderr_text:
-        logger.info("extract_menu.py stderr: %s", stderr_text)
-
-    if completed.returncode != 0:
-        message = stderr_text or "extract_menu.py 실행 중 오류가 발생했습니다."
-        raise ValueError(message)
-
-    stdout_text = (completed.stdout or "").strip()
-    if not stdout_text:
-        raise ValueError("extract_menu.py 결과가 비어 있습니다.")
-
-    try:
-        payload = json.loads(stdout_text)
-    except json.JSONDecodeError as exc:
-        raise ValueError("extract_menu.py 결과를 파싱할 수 없습니다.") from exc
-
-    menus: List[Dict[str, Any]] = list(payload.get("menus") or [])
-    summary = {
-        "source": payload.get("source") or "extract_menu.py",
-        "domain": payload.get("domain"),
-        "count": len(menus),
-        "elapsed": payload.get("elapsed"),
-        "used_playwright": (payload.get("source") or "").lower() == "playwright",
-        "script": True,
-    }
-
-    return {"summary": summary, "menus": menus}
-
-
-def _collect_menu_candidates(
-    url: str,
-    depth: int,
-    timeout: float,
-    user_agent: str,
-) -> Dict[str, Any]:
-    logger.debug(
-        "execute extract_menu.py using interpreter=%s script=%s",
-        _resolve_python_interpreter(),
-        EXTRACT_MENU_SCRIPT,
-    )
-    try:
-        result = _collect_menu_candidates_via_script(url, depth, timeout, user_agent)
-        logger.info(
-            "extract_menu.py를 사용해 %s개의 메뉴를 수집했습니다.",
-            result.get("summary", {}).get("count"),
-        )
-        return result
-    except FileNotFoundError:
-        logger.info("extract_menu.py 파일을 찾을 수 없어 내부 수집 로직을 사용합니다.")
-    except ValueError as exc:
-        logger.warning("extract_menu.py 실행 실패: %s", exc)
-    except Exception as exc:  # pylint: disable=broad-except
-        logger.exception("extract_menu.py 실행 중 예기치 못한 오류가 발생했습니다: %s", exc)
-
-    return _collect_menu_candidates_internal(url, depth, timeout, user_agent)
-
-
-def _resolve_python_interpreter() -> str:
-    venv_path = os.environ.get("VIRTUAL_ENV")
-    if venv_path:
-        candidate = Path(venv_path) / ("Scripts" if os.name == "nt" else "bin") / ("python.exe" if sys.platform == "win32" else "python")
-        if candidate.exists():
-            return str(candidate)
-    return sys.executable
-
-
 def _ensure_absolute_url(domain: str) -> str:
     parsed = urlparse(domain)
     if parsed.scheme and parsed.netloc:
@@ -388,16 +318,14 @@ async def _fetch_system_record(system_code: str) -> Optional[Dict[str, Any]]:
     def _query():
         return (
             supabase.table("inspection_systems")
-            .select("*")
+            .select("system_code, domain, created_by, updated_by")
             .eq("system_code", system_code)
             .limit(1)
             .execute()
         )
 
     response = await asyncio.to_thread(_query)
-    if getattr(response, "error", None):
-        message = response.error.message if hasattr(response.error, "message") else str(response.error)
-        raise ValueError(message)
+    unwrap_response(response)
 
     rows = response.data or []
     return rows[0] if rows else None
@@ -407,7 +335,12 @@ async def fetch_systems(limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """등록된 점검 대상 시스템 목록을 조회한다."""
 
     def _query():
-        query = supabase.table("inspection_systems").select("*").order("created_at", desc=True)
+        # 목록 화면에서 사용하는 컬럼만 조회한다.
+        query = (
+            supabase.table("inspection_systems")
+            .select("system_code, system_name, domain")
+            .order("created_at", desc=True)
+        )
         if limit is not None:
             query = query.limit(limit)
         return query.execute()
@@ -422,7 +355,8 @@ async def fetch_system_menus(system_code: str) -> List[Dict[str, Any]]:
     def _query():
         return (
             supabase.table("inspection_system_menus")
-            .select("*")
+            # 메뉴 패널 스크립트(renderMenus)는 menu_path를 읽으므로 path 컬럼을 그 이름으로 받는다.
+            .select("system_code, menu_name, menu_path:path, created_at")
             .eq("system_code", system_code)
             .order("menu_name")
             .execute()
@@ -430,9 +364,7 @@ async def fetch_system_menus(system_code: str) -> List[Dict[str, Any]]:
 
     response = await asyncio.to_thread(_query)
 
-    if getattr(response, "error", None):
-        message = response.error.message if hasattr(response.error, "message") else str(response.error)
-        raise ValueError(message)
+    unwrap_response(response)
 
     return response.data or []
 
@@ -448,17 +380,25 @@ async def create_system(payload: Dict[str, Any]) -> Dict[str, Any]:
         "updated_by": payload.get("updated_by"),
     }
 
+    # 존재 여부를 따로 조회하지 않고 on conflict do nothing으로 한 번에 처리한다.
+    # 같은 system_code가 이미 있으면 기존 행(created_by 포함)은 그대로 두고 빈 결과가 돌아온다.
     def _insert():
-        return supabase.table("inspection_systems").insert(insertion).execute()
+        return (
+            supabase.table("inspection_systems")
+            .upsert(insertion, on_conflict="system_code", ignore_duplicates=True)
+            .execute()
+        )
 
     response = await asyncio.to_thread(_insert)
 
-    if getattr(response, "error", None):
-        message = response.error.message if hasattr(response.error, "message") else str(response.error)
-        raise ValueError(message)
+    unwrap_response(response)
 
     data = response.data or []
-    return data[0] if data else insertion
+    if not data:
+        raise ValueError("이미 등록된 시스템 코드입니다.")
+
+    invalidate_system_counts()
+    return data[0]
 
 
 async def update_system(system_code: str, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -486,9 +426,7 @@ async def update_system(system_code: str, payload: Dict[str, Any]) -> Dict[str,
 
     response = await asyncio.to_thread(_update)
 
-    if getattr(response, "error", None):
-        message = response.error.message if hasattr(response.error, "message") else str(response.error)
-        raise ValueError(message)
+    unwrap_response(response)
 
     data = response.data or []
     if not data:
@@ -499,61 +437,36 @@ async def update_system(system_code: str, payload: Dict[str, Any]) -> Dict[str,
 async def delete_system(system_code: str) -> None:
     """등록된 점검 대상 시스템 및 연결된 메뉴를 삭제한다."""
 
-    def _delete_menus():
-        return supabase.table("inspection_system_menus").delete().eq("system_code", system_code).execute()
-
-    menu_response = await asyncio.to_thread(_delete_menus)
-
-    if getattr(menu_response, "error", None):
-        message = menu_response.error.message if hasattr(menu_response.error, "message") else str(menu_response.error)
-        raise ValueError(message)
-
-    def _delete_system():
-        return supabase.table("inspection_systems").delete().eq("system_code", system_code).execute()
+    # 메뉴와 시스템 삭제는 delete_inspection_system 함수 안에서 한 트랜잭션으로 처리된다.
+    def _delete():
+        return supabase.rpc("delete_inspection_system", {"p_code": system_code}).execute()
 
-    system_response = await asyncio.to_thread(_delete_system)
+    response = await asyncio.to_thread(_delete)
 
-    if getattr(system_response, "error", None):
-        message = system_response.error.message if hasattr(system_response.error, "message") else str(system_response.error)
-        raise ValueError(message)
+    unwrap_response(response)
 
-    data = system_response.data or []
+    invalidate_system_counts()
+    data = response.data or []
     if not data:
         raise ValueError("해당 시스템을 찾을 수 없습니다.")
 
 
 async def _replace_system_menus(system_code: str, menus: List[Dict[str, Any]], created_by: str) -> None:
-    """기존 메뉴를 삭제하고 새 메뉴를 저장한다."""
-
-    def _delete():
-        return supabase.table("inspection_system_menus").delete().eq("system_code", system_code).execute()
+    """수집한 메뉴 목록으로 시스템 메뉴를 맞춘다. 목록에 없는 메뉴는 삭제하고, 새 메뉴는 추가한다."""
 
-    delete_response = await asyncio.to_thread(_delete)
-    if getattr(delete_response, "error", None):
-        message = delete_response.error.message if hasattr(delete_response.error, "message") else str(delete_response.error)
-        raise ValueError(message)
+    payloads = [{"menu_name": item.get("menu_name"), "path": item.get("path")} for item in menus]
 
-    if not menus:
-        return
+    # 삭제와 upsert는 replace_inspection_system_menus 함수 안에서 한 트랜잭션으로 처리된다.
+    def _replace():
+        return supabase.rpc(
+            "replace_inspection_system_menus",
+            {"p_code": system_code, "p_menus": payloads, "p_created_by": created_by},
+        ).execute()
 
-    payloads: List[Dict[str, Any]] = []
-    for item in menus:
-        payloads.append(
-            {
-                "system_code": system_code,
-                "menu_name": item.get("menu_name"),
-                "path": item.get("path"),
-                "created_by": created_by,
-            }
-        )
-
-    def _insert():
-        return supabase.table("inspection_system_menus").insert(payloads).execute()
+    response = await asyncio.to_thread(_replace)
+    unwrap_response(response)
 
-    insert_response = await asyncio.to_thread(_insert)
-    if getattr(insert_response, "error", None):
-        message = insert_response.error.message if hasattr(insert_response.error, "message") else str(insert_response.error)
-        raise ValueError(message)
+    invalidate_system_counts()
 
 
 async def collect_system_menus(
@@ -577,7 +490,7 @@ async def collect_system_menus(
     target_url = _ensure_absolute_url(domain)
     agent = user_agent or DEFAULT_UA
 
-    result = await asyncio.to_thread(_collect_menu_candidates, target_url, depth, timeout, agent)
+    result = await _collect_menu_candidates(target_url, depth, timeout, agent)
 
     summary: Dict[str, Any] = dict(result.get("summary") or {})
     summary.update(
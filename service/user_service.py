@@ -1,101 +1,59 @@
 from __future__ import annotations
 
-import asyncio
-from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional
 
-from setting.supabase_client import supabase
+from setting.supabase_client import async_supabase, unwrap_response
+
+# 화면에서 사용하는 컬럼만 조회한다. password 등 쓰지 않는 컬럼은 응답에 싣지 않는다.
+# 시각 컬럼은 두 뷰에서 이미 'YYYY-MM-DD HH24:MI' 문자열로 내려오고, 정렬은 원본 값인 created_at_ts로 한다.
+_USER_SELECT = ", ".join((
+    "user_id", "user_name", "email", "role", "ip_address", "login_status",
+    "last_login_at", "created_by", "created_at", "updated_by", "updated_at",
+))
+_HISTORY_SELECT = ", ".join((
+    "history_id", "user_id", "user_name", "menu_code", "menu_name", "menu_path",
+    "action", "action_detail", "result_status", "ip_address", "created_at",
+))
+_USER_REQUIRED = ("user_id", "password", "user_name")
 
 
 async def fetch_users(limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """Supabase에서 사용자 목록을 조회한다."""
 
-    def _query():
-        query = supabase.table("admin_users").select("*").order("created_at", desc=True)
-        if limit is not None:
-            query = query.limit(limit)
-        return query.execute()
-
-    response = await asyncio.to_thread(_query)
-    rows = response.data or []
-    for row in rows:
-        row["last_login_at"] = _format_timestamp(row.get("last_login_at"))
-        row["created_at"] = _format_timestamp(row.get("created_at"))
-        row["updated_at"] = _format_timestamp(row.get("updated_at"))
-    return rows
-
-
-def _format_timestamp(value: Any) -> Optional[str]:
-    """ISO 문자열 또는 datetime 값을 'YYYY-MM-DD HH24:MI'로 반환한다."""
-    if not value:
-        return None
-
-    if isinstance(value, datetime):
-        dt = value
-    else:
-        text = str(value)
-        if text.endswith("Z"):
-            text = text[:-1] + "+00:00"
-        try:
-            dt = datetime.strptime(text, "%Y-%m-%dT%H:%M:%S.%f%z")
-        except ValueError:
-            return text
-    return dt.strftime("%Y-%m-%d %H:%M")
+    query = async_supabase.table("admin_users_view").select(_USER_SELECT).order("created_at_ts", desc=True)
+    if limit is not None:
+        query = query.limit(limit)
+
+    response = await query.execute()
+    return response.data or []
 
 
 async def fetch_user_history(
     *, user_id: Optional[str] = None, menu_code: Optional[str] = None, limit: Optional[int] = None
 ) -> List[Dict[str, Any]]:
-    """사용자 활동 이력을 조회한다."""
-
-    def _query():
-        query = supabase.table("admin_user_history").select("*").order("created_at", desc=True)
-        if user_id:
-            query = query.eq("user_id", user_id)
-        if menu_code:
-            query = query.eq("menu_code", menu_code)
-        if limit is not None:
-            query = query.limit(limit)
-        return query.execute()
-
-    response = await asyncio.to_thread(_query)
-    rows = response.data or []
-    if not rows:
-        return rows
-
-    menu_codes: Set[str] = {row["menu_code"] for row in rows if row.get("menu_code")}
-    user_ids: Set[str] = {row["user_id"] for row in rows if row.get("user_id")}
-
-    menu_map = await _fetch_menu_map(menu_codes) if menu_codes else {}
-    user_map = await _fetch_user_map(user_ids) if user_ids else {}
-
-    for row in rows:
-        row["created_at"] = _format_timestamp(row.get("created_at"))
-        code = row.get("menu_code")
-        menu_info = menu_map.get(code) if code else None
-        row["menu_name"] = menu_info.get("menu_name") if menu_info else None
-        row["menu_path"] = menu_info.get("menu_path") if menu_info else None
-
-        uid = row.get("user_id")
-        user_info = user_map.get(uid) if uid else None
-        row["user_name"] = user_info.get("user_name") if user_info else None
-    return rows
-
-
-async def _fetch_menu_map(codes: Set[str]) -> Dict[str, Dict[str, Any]]:
-    def _query():
-        query = supabase.table("admin_menus").select("menu_code, menu_name, menu_path")
-        return query.in_("menu_code", list(codes)).execute()
-
-    try:
-        response = await asyncio.to_thread(_query)
-        return {item["menu_code"]: item for item in (response.data or []) if item.get("menu_code")}
-    except Exception:  # pylint: disable=broad-except
-        return {}
+    """사용자 활동 이력을 조회한다.
+
+    메뉴명/경로와 사용자명은 admin_user_history_view에서 함께 조회해 추가 왕복 없이 채운다.
+    """
+
+    query = async_supabase.table("admin_user_history_view").select(_HISTORY_SELECT).order("created_at_ts", desc=True)
+    if user_id:
+        query = query.eq("user_id", user_id)
+    if menu_code:
+        query = query.eq("menu_code", menu_code)
+    if limit is not None:
+        query = query.limit(limit)
+
+    response = await query.execute()
+    return response.data or []
 
 
 async def create_user(payload: Dict[str, Any]) -> Dict[str, Any]:
-    """사용자를 생성하고 생성된 레코드를 반환한다."""
+    """사용자를 생성하고 DB에 저장된 레코드를 반환한다."""
+
+    missing = [key for key in _USER_REQUIRED if not payload.get(key)]
+    if missing:
+        raise ValueError(f"필수 항목이 누락되었습니다: {', '.join(missing)}")
 
     insertion = {
         "user_id": payload["user_id"],
@@ -108,26 +66,15 @@ async def create_user(payload: Dict[str, Any]) -> Dict[str, Any]:
         "created_by": payload.get("created_by") or "system",
         "updated_by": payload.get("updated_by"),
     }
-    
-    def _insert():
-        return supabase.table("admin_users").insert(insertion).execute()
-
-    response = await asyncio.to_thread(_insert)
 
-    if getattr(response, "error", None):
-        raise ValueError(response.error.message if hasattr(response.error, "message") else str(response.error))
+    response = await async_supabase.table("admin_users").insert(insertion).execute()
+    unwrap_response(response)
 
     data = response.data or []
-    return data[0] if data else insertion
-
-
-async def _fetch_user_map(user_ids: Set[str]) -> Dict[str, Dict[str, Any]]:
-    def _query():
-        query = supabase.table("admin_users").select("user_id, user_name")
-        return query.in_("user_id", list(user_ids)).execute()
+    if not data:
+        raise ValueError("사용자 생성 결과를 받지 못했습니다.")
 
-    try:
-        response = await asyncio.to_thread(_query)
-        return {item["user_id"]: item for item in (response.data or []) if item.get("user_id")}
-    except Exception:  # pylint: disable=broad-except
-        return {}
\ No newline at end of file
+    # 목록 조회와 마찬가지로 비밀번호는 응답에 포함하지 않는다.
+    created = data[0]
+    created.pop("password", None)
+    return created
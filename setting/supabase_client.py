@@ -1,11 +1,16 @@
+from functools import lru_cache
 from pathlib import Path
+from typing import TypeVar
 import os
 
+import httpx
 from dotenv import load_dotenv
-from supabase import create_client
+from supabase import AsyncClient, AsyncClientOptions, Client, ClientOptions, create_client
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 
+T = TypeVar("T")
+
 # 프로젝트 루트(.env) → setting/.env 순으로 환경 변수 읽기
 load_dotenv(BASE_DIR.parent / ".env")
 load_dotenv(BASE_DIR / ".env")
@@ -25,4 +30,44 @@ if not SUPABASE_KEY:
         "또는 SUPABASE_ANON_KEY가 필요합니다."
     )
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+
+@lru_cache(maxsize=1)
+def get_supabase_client() -> Client:
+    """asyncio.to_thread로 호출하는 동기 클라이언트. 프로세스당 한 번만 만들고 HTTP/2 keep-alive 커넥션을 재사용한다."""
+    return create_client(
+        SUPABASE_URL,
+        SUPABASE_KEY,
+        options=ClientOptions(
+            httpx_client=httpx.Client(
+                http2=True,
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+            ),
+        ),
+    )
+
+
+supabase = get_supabase_client()
+
+# 비동기 핸들러용 클라이언트. asyncio.to_thread 없이 이벤트 루프에서 바로 await하며,
+# HTTP/2 keep-alive 커넥션 풀을 재사용한다. 워커 프로세스마다 모듈이 새로 로드되므로
+# 이벤트 루프 간에 커넥션이 공유되지 않는다.
+async_supabase = AsyncClient(
+    SUPABASE_URL,
+    SUPABASE_KEY,
+    options=AsyncClientOptions(
+        httpx_client=httpx.AsyncClient(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=50),
+        ),
+    ),
+)
+
+
+def unwrap_response(response: T) -> T:
+    """Supabase 응답에 오류가 담겨 있으면 ValueError로 올리고, 아니면 응답을 그대로 반환한다."""
+    error = getattr(response, "error", None)
+    if error:
+        raise ValueError(getattr(error, "message", None) or str(error))
+    return response
@@ -0,0 +1,9 @@
+from pathlib import Path
+
+from fastapi.templating import Jinja2Templates
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+TEMPLATE_DIR = BASE_DIR / "templates"
+
+# 모든 라우터가 같은 Jinja 환경을 공유해 컴파일된 템플릿 캐시를 프로세스 전체에서 재사용한다.
+templates = Jinja2Templates(directory=str(TEMPLATE_DIR))
@@ -107,3 +107,150 @@ insert into admin_user_history (
   ('manager01', 'reports', 'EXPORT', '월간 리포트 내려받기', 'success', '192.168.0.21', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 13_3)', gen_random_uuid(), '{"format": "pdf"}', timezone('utc', now()) - interval '1 hour'),
   ('manager01', 'products', 'UPDATE', '상품 정보 수정 실패', 'error', '192.168.0.21', 'Mozilla/5.0 (Macintosh; Intel Mac OS X 13_3)', gen_random_uuid(), '{"error": "Validation error"}', timezone('utc', now()) - interval '50 minutes'),
   ('analyst02', 'analytics', 'VIEW', '트래픽 분석 대시보드 확인', 'success', '192.168.0.32', 'Mozilla/5.0 (X11; Linux x86_64)', gen_random_uuid(), null, timezone('utc', now()) - interval '10 minutes');
+
+-- 사용자 활동 이력 조회용 뷰
+-- 메뉴명/경로와 사용자명을 DB에서 붙여 한 번의 조회로 가져온다.
+-- 이력에는 admin_menus에 없는 menu_code('login' 등)도 기록되므로 외래키 대신 left join을 사용한다.
+-- created_at은 화면 표시 형식(UTC, 'YYYY-MM-DD HH24:MI')으로 내려주고, 정렬은 created_at_ts로 한다.
+-- security_invoker로 조회하는 역할의 RLS 정책이 원본 테이블에 그대로 적용된다.
+drop view if exists admin_user_history_view;
+create view admin_user_history_view
+with (security_invoker = true)
+as
+select
+  h.history_id,
+  h.user_id,
+  u.user_name,
+  h.menu_code,
+  m.menu_name,
+  m.menu_path,
+  h.action,
+  h.action_detail,
+  h.result_status,
+  h.ip_address,
+  to_char(h.created_at at time zone 'UTC', 'YYYY-MM-DD HH24:MI') as created_at,
+  h.created_at as created_at_ts
+from admin_user_history h
+left join admin_menus m on m.menu_code = h.menu_code
+left join admin_users u on u.user_id = h.user_id;
+
+-- 사용자 목록 조회용 뷰
+-- 비밀번호를 제외한 컬럼만 노출하고, 시각 컬럼은 표시 형식(UTC, 'YYYY-MM-DD HH24:MI')으로 내려준다.
+drop view if exists admin_users_view;
+create view admin_users_view
+with (security_invoker = true)
+as
+select
+  user_id,
+  user_name,
+  email,
+  role,
+  ip_address,
+  login_status,
+  to_char(last_login_at at time zone 'UTC', 'YYYY-MM-DD HH24:MI') as last_login_at,
+  created_by,
+  to_char(created_at at time zone 'UTC', 'YYYY-MM-DD HH24:MI') as created_at,
+  updated_by,
+  to_char(updated_at at time zone 'UTC', 'YYYY-MM-DD HH24:MI') as updated_at,
+  created_at as created_at_ts
+from admin_users;
+
+
+-- 점검 대상 시스템 삭제 함수
+-- 메뉴와 시스템을 한 트랜잭션에서 삭제해 한 번의 호출로 처리한다. 삭제된 시스템 행을 반환한다.
+create or replace function delete_inspection_system(p_code text)
+returns setof inspection_systems
+language sql
+as $$
+  delete from inspection_system_menus where system_code = p_code;
+  delete from inspection_systems where system_code = p_code returning *;
+$$;
+
+
+-- 메뉴 upsert(on conflict)용 유니크 인덱스. 함수보다 먼저 만들어야 하며,
+-- 기존에 중복된 (system_code, path) 행이 있으면 먼저 정리한다.
+create unique index if not exists uq_ism_system_path
+  on inspection_system_menus (system_code, path);
+
+-- 점검 대상 시스템 메뉴 교체 함수
+-- 새 목록에 없는 메뉴만 삭제하고, 나머지는 (system_code, path) 기준으로 upsert해 바뀐 행만 쓴다.
+-- 한 트랜잭션에서 처리하므로 한 번의 호출로 끝난다. p_menus는 [{"menu_name": ..., "path": ...}] 형태의 배열이다.
+create or replace function replace_inspection_system_menus(p_code text, p_menus jsonb, p_created_by text)
+returns void
+language sql
+as $$
+  delete from inspection_system_menus ism
+  where ism.system_code = p_code
+    and not exists (
+      select 1
+      from jsonb_array_elements(p_menus) as e(item)
+      where e.item->>'path' = ism.path
+    );
+
+  -- 같은 path가 여러 번 들어오면 처음 항목을 사용한다.
+  insert into inspection_system_menus (system_code, menu_name, path, created_by)
+  select distinct on (e.item->>'path') p_code, e.item->>'menu_name', e.item->>'path', p_created_by
+  from jsonb_array_elements(p_menus) with ordinality as e(item, ord)
+  order by e.item->>'path', e.ord
+  on conflict (system_code, path) do update
+    set menu_name = excluded.menu_name
+    where inspection_system_menus.menu_name is distinct from excluded.menu_name;
+$$;
+
+
+-- 오늘(Asia/Seoul) 점검 오류 수 조회 함수
+-- 하루의 경계를 DB에서 계산해 inspected_at 범위 조건이 인덱스를 그대로 사용할 수 있게 한다.
+create or replace function count_today_inspection_errors()
+returns bigint
+language sql
+stable
+as $$
+  select count(*)
+  from inspection_history
+  where inspection_result = 'error'
+    and inspected_at >= date_trunc('day', now() at time zone 'Asia/Seoul') at time zone 'Asia/Seoul'
+    and inspected_at < (date_trunc('day', now() at time zone 'Asia/Seoul') + interval '1 day') at time zone 'Asia/Seoul';
+$$;
+
+
+-- 기간별 로그인 성공 수 조회 함수
+-- idx_ah_login_success_created 부분 인덱스의 created_at 범위만 세어 숫자 하나를 반환한다.
+create or replace function count_success_logins(p_start timestamptz, p_end timestamptz)
+returns bigint
+language sql
+stable
+as $$
+  select count(*)
+  from admin_user_history
+  where menu_code = 'login'
+    and result_status = 'success'
+    and created_at >= p_start
+    and created_at < p_end;
+$$;
+
+
+-- 조회 성능용 인덱스
+-- 운영 중인 테이블에 추가할 때는 트랜잭션 밖에서 create index concurrently로 실행한다.
+-- 시스템별 메뉴 목록(system_code 조건 + menu_name 정렬)을 인덱스 순서대로 읽는다.
+create index if not exists idx_ism_system_name
+  on inspection_system_menus (system_code, menu_name);
+
+-- 주간 로그인 성공 수 집계용 부분 인덱스
+create index if not exists idx_ah_login_success_created
+  on admin_user_history (created_at)
+  where menu_code = 'login' and result_status = 'success';
+
+-- 사용자 활동 이력 목록(created_at 역순, 사용자/메뉴 조건)을 정렬 없이 인덱스 순서대로 읽는다.
+create index if not exists idx_ah_created
+  on admin_user_history (created_at desc);
+
+create index if not exists idx_ah_user_created
+  on admin_user_history (user_id, created_at desc);
+
+create index if not exists idx_ah_menu_created
+  on admin_user_history (menu_code, created_at desc);
+
+-- 오늘 점검 오류 수 집계용 부분 인덱스
+create index if not exists idx_ih_error_inspected
+  on inspection_history (inspected_at)
+  where inspection_result = 'error';
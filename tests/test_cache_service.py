@@ -0,0 +1,54 @@
+import asyncio
+
+from service import cache_service
+from service.cache_service import async_ttl_cache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def test_expired_keys_are_evicted_on_refresh(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_service.time, "monotonic", clock.monotonic)
+    calls = []
+
+    @async_ttl_cache(60.0)
+    async def count(week: int) -> int:
+        calls.append(week)
+        return week * 10
+
+    async def scenario():
+        for week in range(5):
+            assert await count(week) == week * 10
+            assert await count(week) == week * 10
+            clock.now += 61.0
+
+    asyncio.run(scenario())
+
+    assert calls == [0, 1, 2, 3, 4]
+    # 주가 바뀔 때마다 이전 주 키는 만료되어 지워지고 마지막 키만 남는다.
+    assert count.cache_size() == 1
+
+
+def test_live_entries_are_kept(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_service.time, "monotonic", clock.monotonic)
+
+    @async_ttl_cache(lambda key: 600.0 if key == "long" else 10.0)
+    async def load(key: str) -> str:
+        return key
+
+    async def scenario():
+        await load("long")
+        await load("short")
+        clock.now += 11.0
+        await load("other")
+
+    asyncio.run(scenario())
+
+    assert load.cache_size() == 2
@@ -0,0 +1,52 @@
+import asyncio
+import importlib
+from types import SimpleNamespace
+
+from service.dashboard_service import DASHBOARD_SUMMARY_KEYS
+
+# router.admin 패키지는 같은 이름으로 APIRouter 객체를 내보내므로 모듈은 import_module로 가져온다.
+dashboard_router = importlib.import_module("router.admin.dashboard_router")
+
+
+def _render_context(monkeypatch, *, summary, logs):
+    captured = {}
+
+    def fake_template_response(name, context):
+        captured.update(context)
+        return name
+
+    monkeypatch.setattr(dashboard_router, "fetch_dashboard_summary", summary)
+    monkeypatch.setattr(dashboard_router, "_fetch_status_logs", logs)
+    monkeypatch.setattr(dashboard_router.templates, "TemplateResponse", fake_template_response)
+    asyncio.run(dashboard_router.admin_dashboard(SimpleNamespace()))
+    return captured
+
+
+def test_summary_failure_is_shown_on_every_card(monkeypatch):
+    async def failing_summary():
+        raise RuntimeError("summary down")
+
+    async def logs():
+        return [{"message": "ok"}]
+
+    context = _render_context(monkeypatch, summary=failing_summary, logs=logs)
+
+    assert context["supabase_logs"] == [{"message": "ok"}]
+    assert context["supabase_error"] is None
+    for key in DASHBOARD_SUMMARY_KEYS:
+        assert context[key] is None
+        assert context[f"{key}_error"] == "summary down"
+
+
+def test_status_log_failure_keeps_summary(monkeypatch):
+    async def summary():
+        return {"systems_count": 3, "systems_count_error": None}
+
+    async def failing_logs():
+        raise RuntimeError("logs down")
+
+    context = _render_context(monkeypatch, summary=summary, logs=failing_logs)
+
+    assert context["supabase_logs"] == []
+    assert context["supabase_error"] == "logs down"
+    assert context["systems_count"] == 3
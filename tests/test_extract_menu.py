@@ -0,0 +1,72 @@
+import pytest
+
+from extract_menu import extract_candidates, parse_html, resolve_encoding
+
+BASE_URL = "https://example.com/"
+DOMAIN = "example.com"
+
+
+def _extract(markup: str, **kwargs):
+    candidates, _ = extract_candidates(parse_html(markup.encode()), BASE_URL, DOMAIN, **kwargs)
+    return candidates
+
+
+def test_nav_link_wins_over_earlier_header_link():
+    markup = """
+    <html><body>
+      <header id="top"><a href="/about">About us</a></header>
+      <nav aria-label="Main"><a href="/about">About nav</a></nav>
+    </body></html>
+    """
+    candidates = _extract(markup)
+
+    assert candidates["https://example.com/about"] == {
+        "text": "About nav",
+        "url": "https://example.com/about",
+        "path": ["Main"],
+    }
+
+
+def test_candidates_follow_region_order():
+    markup = """
+    <html><body>
+      <a href="/plain">Plain</a>
+      <div class="menu"><a href="/hint">Hint</a></div>
+      <div role="navigation"><a href="/role">Role</a></div>
+      <header><a href="/header">Header</a></header>
+      <nav><a href="/nav">Nav</a></nav>
+    </body></html>
+    """
+    candidates = _extract(markup)
+
+    assert [value["text"] for value in candidates.values()] == ["Nav", "Header", "Role", "Hint", "Plain"]
+    assert list(_extract(markup, max_candidates=2)) == [
+        "https://example.com/nav",
+        "https://example.com/header",
+    ]
+
+
+def test_link_text_skips_script_and_style():
+    markup = """
+    <html><body><nav>
+      <a href="/menu"><script>var x = 1;</script><style>.a { color: red; }</style>Menu <b>Item</b><!-- note --></a>
+    </nav></body></html>
+    """
+    candidates = _extract(markup)
+
+    assert candidates["https://example.com/menu"]["text"] == "Menu Item"
+
+
+@pytest.mark.parametrize("label", ["ks_c_5601-1987", "euc-kr", "windows-949", "CP949"])
+def test_parse_html_normalizes_korean_charset_labels(label):
+    markup = "<html><body><nav><a href='/intro'>소개</a></nav></body></html>"
+
+    candidates, _ = extract_candidates(parse_html(markup.encode("cp949"), label), BASE_URL, DOMAIN)
+
+    assert candidates["https://example.com/intro"]["text"] == "소개"
+
+
+def test_resolve_encoding_rejects_unknown_labels():
+    assert resolve_encoding("ks_c_5601-1987") == "cp949"
+    assert resolve_encoding("x-unknown") is None
+    assert resolve_encoding(None) is None
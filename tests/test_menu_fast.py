@@ -0,0 +1,121 @@
+import pytest
+from bs4 import BeautifulSoup
+
+from service._menu_fast import extract_candidates_from_soup, extract_candidates_streaming, resolve_encoding
+
+BASE_URL = "https://example.com/docs/"
+DOMAIN = "example.com"
+
+PAGES = [
+    # nav 안의 링크가 앞서 나온 header 링크보다 우선한다.
+    """<html><body>
+      <header id="top"><a href="/about">About us</a></header>
+      <nav aria-label="Main"><ul class="gnb"><li><a href="/about">About nav</a></li></ul></nav>
+    </body></html>""",
+    # role, 클래스 힌트, 그 외 영역 순위와 경로 라벨
+    """<html><body>
+      <a href="/x">Plain</a>
+      <div class="sidebar"><ul aria-label="Docs"><li><a href="/x">Hint</a><a href="guide">Guide</a></li></ul></div>
+      <main role="navigation"><a href="/x">Role</a></main>
+      <footer class="menu"><a href="/y#top">Footer</a></footer>
+      <a href="/y">Y plain</a>
+    </body></html>""",
+    # 제외 문구, 다른 도메인, mailto, script/style 텍스트
+    """<html><head><title>t</title></head><body>
+      <nav>
+        <a href="/privacy">Privacy Policy</a>
+        <a href="https://other.example.org/">Other</a>
+        <a href="mailto:a@example.com">Mail</a>
+        <a href="/menu"><script>var x = 1;</script><style>.a{}</style>Menu <b>Item</b></a>
+        <a href="/empty"> </a>
+      </nav>
+    </body></html>""",
+]
+
+
+def _soup_result(markup: str):
+    return extract_candidates_from_soup(BeautifulSoup(markup, "lxml"), BASE_URL, DOMAIN, True)
+
+
+@pytest.mark.parametrize("markup", PAGES)
+def test_streaming_matches_soup(markup):
+    soup_candidates, soup_links = _soup_result(markup)
+    stream_candidates, stream_links = extract_candidates_streaming(
+        markup.encode("utf-8"), "utf-8", BASE_URL, DOMAIN, True
+    )
+
+    assert list(stream_candidates.items()) == list(soup_candidates.items())
+    assert stream_links == soup_links
+
+
+def test_streaming_prefers_nav_over_earlier_header():
+    candidates, _ = extract_candidates_streaming(PAGES[0].encode(), None, BASE_URL, DOMAIN)
+
+    assert candidates["https://example.com/about"] == {
+        "text": "About nav",
+        "url": "https://example.com/about",
+        "path": ["Main", "gnb"],
+    }
+
+
+def test_streaming_uses_role_rank_of_any_element():
+    candidates, _ = extract_candidates_streaming(PAGES[1].encode(), None, BASE_URL, DOMAIN)
+
+    assert candidates["https://example.com/x"]["text"] == "Role"
+    assert candidates["https://example.com/y"]["text"] == "Footer"
+
+
+@pytest.mark.parametrize("label", ["ks_c_5601-1987", "euc-kr", "windows-949", "CP949"])
+def test_streaming_decodes_korean_charset_labels(label):
+    markup = "<html><body><nav><a href='/intro'>소개</a></nav></body></html>"
+
+    candidates, _ = extract_candidates_streaming(markup.encode("cp949"), label, BASE_URL, DOMAIN)
+
+    assert candidates["https://example.com/intro"]["text"] == "소개"
+
+
+@pytest.mark.parametrize("label", ["x-unknown", "ansi", "none", ""])
+def test_streaming_ignores_unknown_charset_labels(label):
+    markup = "<html><body><nav><a href='/intro'>소개</a></nav></body></html>"
+
+    candidates, _ = extract_candidates_streaming(markup.encode("utf-8"), label, BASE_URL, DOMAIN)
+
+    assert candidates["https://example.com/intro"]["text"] == "소개"
+
+
+def test_streaming_uses_meta_charset_without_header():
+    markup = "<html><head><meta charset='ks_c_5601-1987'></head><body><a href='/intro'>소개</a></body></html>"
+
+    candidates, _ = extract_candidates_streaming(markup.encode("cp949"), None, BASE_URL, DOMAIN)
+
+    assert candidates["https://example.com/intro"]["text"] == "소개"
+
+
+def test_resolve_encoding():
+    assert resolve_encoding("ks_c_5601-1987") == "cp949"
+    assert resolve_encoding('"UTF-8"') == "utf-8"
+    assert resolve_encoding("x-sjis") == "shift_jis"
+    assert resolve_encoding("none") is None
+    assert resolve_encoding(None) is None
+
+
+def test_streaming_drops_finished_subtrees(monkeypatch):
+    from service import _menu_fast
+
+    parsers = []
+    iterparse = _menu_fast.etree.iterparse
+
+    def recording_iterparse(*args, **kwargs):
+        parser = iterparse(*args, **kwargs)
+        parsers.append(parser)
+        return parser
+
+    monkeypatch.setattr(_menu_fast.etree, "iterparse", recording_iterparse)
+    items = "".join(f"<li><span>{i}</span><a href='/p{i}'>Page {i}</a></li>" for i in range(2000))
+    markup = f"<html><body><ul>{items}</ul></body></html>"
+
+    candidates, _ = extract_candidates_streaming(markup.encode(), "utf-8", BASE_URL, DOMAIN)
+
+    assert len(candidates) == 2000
+    # 마지막 링크까지의 경로(html, body, ul, li, a)만 남는다.
+    assert sum(1 for _ in parsers[0].root.iter()) == 5
@@ -0,0 +1,115 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from service import system_service
+
+
+class _FakeTable:
+    def __init__(self, existing):
+        self.existing = existing
+        self.calls = []
+
+    def upsert(self, row, **kwargs):
+        self.calls.append((row, kwargs))
+        self._row = row
+        self._kwargs = kwargs
+        return self
+
+    def execute(self):
+        code = self._row["system_code"]
+        if code in self.existing:
+            if self._kwargs.get("ignore_duplicates"):
+                return SimpleNamespace(data=[], error=None)
+            self.existing[code].update(self._row)
+            return SimpleNamespace(data=[dict(self.existing[code])], error=None)
+        self.existing[code] = dict(self._row)
+        return SimpleNamespace(data=[dict(self._row)], error=None)
+
+
+@pytest.fixture
+def fake_table(monkeypatch):
+    table = _FakeTable(
+        {"sys01": {"system_code": "sys01", "system_name": "기존", "domain": "old.example.com", "created_by": "admin"}}
+    )
+    monkeypatch.setattr(system_service, "supabase", SimpleNamespace(table=lambda name: table))
+    monkeypatch.setattr(system_service, "invalidate_system_counts", lambda: None)
+    return table
+
+
+def test_create_system_inserts_new_code(fake_table):
+    payload = {"system_code": "sys02", "system_name": "신규", "domain": "new.example.com"}
+
+    created = asyncio.run(system_service.create_system(payload))
+
+    assert created["system_code"] == "sys02"
+    assert created["created_by"] == "system"
+
+
+def test_create_system_rejects_existing_code_without_overwriting(fake_table):
+    payload = {"system_code": "sys01", "system_name": "덮어쓰기", "domain": "new.example.com", "created_by": "other"}
+
+    with pytest.raises(ValueError, match="이미 등록된"):
+        asyncio.run(system_service.create_system(payload))
+
+    assert fake_table.existing["sys01"] == {
+        "system_code": "sys01",
+        "system_name": "기존",
+        "domain": "old.example.com",
+        "created_by": "admin",
+    }
+    assert fake_table.calls[-1][1] == {"on_conflict": "system_code", "ignore_duplicates": True}
+
+
+def test_rendered_page_keeps_role_rank_of_any_element():
+    html = '<html><body><a href="/x">Plain</a><main role="navigation"><a href="/x">Nav</a></main></body></html>'
+
+    candidates = system_service._parse_rendered_page(html, "https://example.com/", "example.com")
+
+    assert candidates["https://example.com/x"]["text"] == "Nav"
+
+
+class _FakeSelect:
+    def __init__(self, rows):
+        self.rows = rows
+        self.columns = None
+
+    def select(self, columns):
+        self.columns = columns
+        return self
+
+    def eq(self, *_args):
+        return self
+
+    def order(self, *_args):
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=self.rows, error=None)
+
+
+def test_fetch_system_menus_aliases_path_for_menu_panel(monkeypatch):
+    table = _FakeSelect([{"system_code": "sys01", "menu_name": "소개", "menu_path": "Main", "created_at": None}])
+    monkeypatch.setattr(system_service, "supabase", SimpleNamespace(table=lambda name: table))
+
+    menus = asyncio.run(system_service.fetch_system_menus("sys01"))
+
+    # templates/admin/system.html의 renderMenus는 menu.menu_path를 읽는다.
+    assert "menu_path:path" in table.columns
+    assert menus[0]["menu_path"] == "Main"
+
+
+def test_close_http_client_closes_and_allows_reopen():
+    async def scenario():
+        client = system_service._get_http_client()
+        assert system_service._get_http_client() is client
+
+        await system_service.close_http_client()
+
+        assert client.is_closed
+        reopened = system_service._get_http_client()
+        assert reopened is not client and not reopened.is_closed
+        await system_service.close_http_client()
+
+    asyncio.run(scenario())